@@ -1,22 +1,78 @@
 import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterable
 from functools import partial
 import json
-from typing import Any, cast
+from pathlib import Path
+import time
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, TypeAlias, cast
 from typing_extensions import override
 
 from nonebot import get_plugin_config
 from nonebot.adapters import Adapter as BaseAdapter
-from nonebot.compat import type_validate_python
+from nonebot.compat import type_validate_json, type_validate_python
 from nonebot.drivers import URL, Driver, HTTPServerSetup, Request, Response
 from nonebot.internal.driver import ASGIMixin, HTTPClientMixin
 from nonebot.utils import escape_tag
 
 from .bot import Bot, HookBot, TokenBot
+from .breaker import BreakerState, CircuitBreaker
 from .config import BotInfo, Config
 from .event import OrderNotifyEvent
-from .exception import ActionFailed, ApiNotAvailable
-from .payload import OrderResponse, PingResponse
-from .utils import construct_request, log, parse_response
+from .exception import (
+    ActionFailed,
+    ApiNotAvailable,
+    CircuitBreakerOpen,
+    NetworkError,
+)
+from .payload import Order, OrderResponse, PingResponse
+from .utils import Signer, construct_request, log, parse_response
+
+if TYPE_CHECKING:
+    # 按需加载的可选功能，仅在启用时导入
+    from .cache import CacheBackend
+    from .export import ExportPipeline, Sink
+    from .health import HealthMonitor
+    from .ipc import IngestClient, IngestServer
+    from .reconcile import Reconciler
+    from .record import WebhookRecorder
+
+TEST_OUT_TRADE_NO = "202106232138371083454010626"
+"""爱发电后台发送测试 Webhook 时使用的订单号"""
+
+
+def _webhook_response(status_code: int, em: str) -> Response:
+    return Response(
+        status_code,
+        headers={"Content-Type": "application/json"},
+        content=json.dumps({"ec": status_code, "em": em}).encode(),
+    )
+
+
+# Webhook 各处理结果对应的响应，预先构建并在请求间共享，不可修改
+WEBHOOK_RESPONSES = MappingProxyType(
+    {
+        "success": _webhook_response(200, "success"),
+        "bot_not_found": _webhook_response(404, "bot not found"),
+        "data_empty": _webhook_response(400, "data is empty"),
+        "parse_failed": _webhook_response(400, "parse data failed"),
+        "verify_request_failed": _webhook_response(
+            400, "Webhook data request failed when verify"
+        ),
+        "order_list_empty": _webhook_response(400, "order list is empty"),
+        "order_not_found": _webhook_response(400, "order not found when verify"),
+        "upstream_unavailable": _webhook_response(503, "upstream unavailable"),
+    }
+)
+
+EventFilter: TypeAlias = Callable[[OrderNotifyEvent], bool]
+"""事件过滤器，返回 True 表示需要该事件"""
+
+ASGIApp: TypeAlias = Callable[
+    [dict[str, Any], Callable[[], Awaitable[dict[str, Any]]], Callable[..., Any]],
+    Awaitable[None],
+]
 
 
 class Adapter(BaseAdapter):
@@ -25,6 +81,64 @@ class Adapter(BaseAdapter):
         super().__init__(driver, **kwargs)
         self.afdian_config: Config = get_plugin_config(Config)
         self.tasks: list[asyncio.Task] = []
+        self.breaker = CircuitBreaker(
+            failure_threshold=self.afdian_config.afdian_breaker_failure_threshold,
+            latency_threshold=self.afdian_config.afdian_breaker_latency_threshold,
+            recovery_timeout=self.afdian_config.afdian_breaker_recovery_timeout,
+        )
+        self.quarantine: deque[tuple[str, OrderNotifyEvent]] = deque()
+        """熔断期间以 quarantine 策略接收的未验证事件：(user_id, event)"""
+        self.quarantine_dropped: int = 0
+        """隔离队列中重新验证未通过或无法分发而丢弃的事件数"""
+        self._probe_task: asyncio.Task | None = None
+        self.bot_infos: dict[str, BotInfo] = {
+            bot_info.user_id: bot_info for bot_info in self.afdian_config.afdian_bots
+        }
+        """当前生效的 Bot 配置，热重载时按差异更新"""
+        if bots_file := self.afdian_config.afdian_bots_file:
+            self.bot_infos = {
+                bot_info.user_id: bot_info
+                for bot_info in type_validate_python(
+                    list[BotInfo], json.loads(bots_file.read_text(encoding="utf-8"))
+                )
+            }
+        self._routes: set[str] = set()
+        self._signers: dict[str, Signer] = {}
+        """ingest 模式下验证订单使用的签名器，其余情况使用 TokenBot 的签名器"""
+        self.reconcilers: dict[str, "Reconciler"] = {}
+        """开启对账时每个 TokenBot 的对账器，Bot 断开重连时保留，移除 Bot 时删除"""
+        self._started_at = time.time()
+        self._reconcile_tasks: dict[str, asyncio.Task] = {}
+        self._ingest_server: "IngestServer | None" = None
+        self._ingest_client: "IngestClient | None" = None
+        self.health: "HealthMonitor | None" = None
+        """Bot 健康检查，afdian_health_interval 为 0 时关闭"""
+        if self.afdian_config.afdian_health_interval > 0:
+            from .health import HealthMonitor
+
+            self.health = HealthMonitor(
+                self,
+                interval=self.afdian_config.afdian_health_interval,
+                retry_interval=self.afdian_config.afdian_health_retry_interval,
+                disconnect_after=self.afdian_config.afdian_health_disconnect_after,
+            )
+        self.recorder: "WebhookRecorder | None" = None
+        """Webhook 流量记录，配置 afdian_record_path 后开启"""
+        if self.afdian_config.afdian_record_path:
+            from .record import WebhookRecorder
+
+            self.recorder = WebhookRecorder(self.afdian_config.afdian_record_path)
+            self.driver.on_shutdown(self.recorder.flush)
+        self.cache: "CacheBackend | None" = None
+        """API 结果缓存，配置 afdian_cache_path 或调用 set_cache_backend 后开启"""
+        if self.afdian_config.afdian_cache_path:
+            from .cache import SQLiteCache
+
+            self.cache = SQLiteCache(self.afdian_config.afdian_cache_path)
+        self.exporters: list["ExportPipeline"] = []
+        """订单导出管道，见 add_exporter"""
+        self.event_filters: list[EventFilter] = []
+        """事件过滤器，见 add_event_filter"""
         self.webhook_url = (
             f"/afdian/{self.afdian_config.afdian_hook_secret}/webhooks/"
             if self.afdian_config.afdian_hook_secret
@@ -50,98 +164,434 @@ class Adapter(BaseAdapter):
             )
 
         # 为每一个配置过的 Bot 设置专属路由
-        for bot_info in self.afdian_config.afdian_bots:
-            webhook_route = HTTPServerSetup(
-                URL(self.webhook_url + bot_info.user_id),
-                "POST",
-                self.get_name(),
-                partial(
-                    self._handle_webhook, user_id=bot_info.user_id, token=bot_info.token
-                ),
-            )
-            self.setup_http_server(webhook_route)
+        for user_id in self.bot_infos:
+            self._setup_route(user_id)
         self.on_ready(self._startup)
+        self.driver.on_shutdown(self._cancel_tasks)
+        self.driver.on_shutdown(self._close_exporters)
+        self.driver.on_shutdown(self._close_cache)
+        if self.afdian_config.afdian_ingest_mode == "host":
+            from .ipc import IngestServer
+
+            self._ingest_server = IngestServer(
+                self.afdian_config.afdian_ingest_socket, self._handle_ingest
+            )
+            self.driver.on_startup(self._ingest_server.start)
+            self.driver.on_shutdown(self._ingest_server.close)
+        elif self.afdian_config.afdian_ingest_mode == "ingest":
+            from .ipc import IngestClient
+
+            self._ingest_client = IngestClient(self.afdian_config.afdian_ingest_socket)
+            self.driver.on_shutdown(self._ingest_client.close)
+
+    def _setup_route(self, user_id: str) -> None:
+        """为 Bot 注册 Webhook 路由，已注册过的不会重复注册"""
+        if user_id in self._routes:
+            return
+        webhook_route = HTTPServerSetup(
+            URL(self.webhook_url + user_id),
+            "POST",
+            self.get_name(),
+            partial(self._handle_webhook, user_id=user_id),
+        )
+        self.setup_http_server(webhook_route)
+        self._routes.add(user_id)
 
     async def _startup(self):
         log("INFO", "AFDian Adapter startup.")
-        for bot_info in self.afdian_config.afdian_bots:
-            if bot_info.token:
-                self.tasks.append(asyncio.create_task(self._connect_bot(bot_info)))
-                log(
-                    "INFO",
-                    f"Bot <y>{escape_tag(bot_info.user_id)}</y> will connect with token.",
-                )
-            else:
-                bot = HookBot(self, self_id=bot_info.user_id)
-                self.bot_connect(bot)
-                log(
-                    "INFO",
-                    f"<y>Bot {escape_tag(bot_info.user_id)}</y> has no token, "
-                    f"<y>skipped connecting</y>.",
-                )
+        for bot_info in self.bot_infos.values():
+            self._start_bot(bot_info)
+        if self.afdian_config.afdian_bots_file:
+            self.watch_bots(
+                self._bots_file_source(self.afdian_config.afdian_bots_file),
+                self.afdian_config.afdian_bots_reload_interval,
+            )
 
-    async def _handle_webhook(
-        self, request: Request, user_id: str, token: str | None = None
-    ) -> Response:
+    def _start_bot(self, bot_info: BotInfo) -> None:
+        if self._ingest_client:
+            # ingest 进程只负责接收与验证，不持有 Bot
+            return
+        if bot_info.token:
+            self.tasks.append(asyncio.create_task(self._connect_bot(bot_info)))
+            if self.health:
+                # 连接失败的 Bot 也由健康检查定时重连
+                self.health.watch(bot_info.user_id)
+            log(
+                "INFO",
+                f"Bot <y>{escape_tag(bot_info.user_id)}</y> will connect with token.",
+            )
+        else:
+            if self.health:
+                self.health.unwatch(bot_info.user_id)
+            bot = HookBot(self, self_id=bot_info.user_id)
+            self.bot_connect(bot)
+            log(
+                "INFO",
+                f"<y>Bot {escape_tag(bot_info.user_id)}</y> has no token, "
+                f"<y>skipped connecting</y>.",
+            )
+
+    async def _handle_webhook(self, request: Request, user_id: str) -> Response:
         """
         处理 Webhook 请求
         该函数会验证请求的合法性，并将订单通知事件传递给对应的 Bot 进行处理
 
         :param request: 请求对象
         :param user_id: Bot 用户 ID
-        :param token: Bot Token 可选
         :return: 响应对象
         """
+        if self.recorder:
+            self.recorder.record(user_id, request.content)
+        bot_info = self.bot_infos.get(user_id)
+        token = bot_info.token if bot_info else None
+        if bot_info is None or (
+            self._ingest_client is None
+            and user_id not in self.bots
+            and not (token and self.health)
+        ):
+            # Bot 已被移除或尚未连接，路由无法注销，在此拒绝；
+            # 开启健康检查时，未连接的 TokenBot 会被重连，其订单按熔断策略处理
+            log("ERROR", f"Webhook for unknown bot {escape_tag(user_id)}.")
+            return WEBHOOK_RESPONSES["bot_not_found"]
+
         if not request.content:
             log("ERROR", "Webhook data is empty.")
-            return Response(
-                400,
-                headers={"Content-Type": "application/json"},
-                content='{"ec": 400, "em": "data is empty"}',
-            )
-        json_data = json.loads(request.content)
+            return WEBHOOK_RESPONSES["data_empty"]
         try:
-            event = type_validate_python(OrderNotifyEvent, json_data)
+            # 直接从原始请求体校验，不经过中间 dict
+            event = type_validate_json(OrderNotifyEvent, request.content)
         except Exception as e:
             log("ERROR", f"Webhook data parse to event failed: {e}")
-            return Response(
-                400,
-                headers={"Content-Type": "application/json"},
-                content='{"ec": 400, "em": "parse data failed"}',
-            )
+            return WEBHOOK_RESPONSES["parse_failed"]
 
-        if event.data.order.out_trade_no == "202106232138371083454010626":
+        if event.data.order.out_trade_no == TEST_OUT_TRADE_NO:
             # 测试订单号，用于测试 webhook 是否能正常收到
             log(
                 "INFO",
-                "Webhook received <y>test order</y> notify: 202106232138371083454010626",
-            )
-            bot = cast(HookBot, self.bots[user_id])
-            asyncio.create_task(bot.handle_event(event))
-            return Response(
-                200,
-                headers={"Content-Type": "application/json"},
-                content='{"ec": 200, "em": "success"}',
+                f"Webhook received <y>test order</y> notify: {TEST_OUT_TRADE_NO}",
             )
+            return await self._dispatch_webhook(user_id, event)
 
         if not token:
             # 如果没有token，则代表为HookBot，只接受Hook交给Bot处理，不做验证
-            bot = cast(HookBot, self.bots[user_id])
-            asyncio.create_task(bot.handle_event(event))
-            return Response(
-                200,
-                headers={"Content-Type": "application/json"},
-                content='{"ec": 200, "em": "success"}',
-            )
+            return await self._dispatch_webhook(user_id, event)
+
+        if self._bot_unavailable(user_id):
+            # Bot 未连接或最近一次健康检查失败，验证请求大概率失败，按熔断策略处理
+            return await self._handle_breaker_open(user_id, event)
 
         # 每当有订单时，平台会请求开发者配置的url（如果服务器异常，可能不保证能及时推送，因此建议结合API一起使用）
-        verify_request = construct_request(
+        try:
+            error = await self._verify_order(
+                user_id, token, event.data.order.out_trade_no
+            )
+        except CircuitBreakerOpen:
+            return await self._handle_breaker_open(user_id, event)
+
+        if error:
+            return WEBHOOK_RESPONSES[error]
+        event._verified = True
+        return await self._dispatch_webhook(user_id, event)
+
+    def asgi_webhook_app(self, lifespan: bool = False) -> ASGIApp:
+        """
+        不经过驱动器路由的轻量 ASGI Webhook 应用，可挂载到其他 ASGI 服务器，
+        路径与驱动器中注册的 Webhook 路由一致，处理流程同 _handle_webhook
+
+        :param lifespan: 是否由该应用驱动 NoneBot 驱动器的生命周期（启动/连接 Bot），
+            仅在独立进程中单独部署时开启；驱动器自身也在同一进程中运行其生命周期时
+            （如同时运行 FastAPI 驱动器的服务）不可开启，否则启动时报告 startup.failed
+        :return: ASGI 应用
+        :raises RuntimeError: lifespan 为 True 但当前驱动器没有可驱动的生命周期
+        """
+        prefix = self.webhook_url
+        # NoneBot 没有公开驱动器生命周期的启动/关闭接口，只能使用驱动器内部的 _lifespan
+        driver_lifespan = getattr(self.driver, "_lifespan", None) if lifespan else None
+        if lifespan and not (
+            callable(getattr(driver_lifespan, "startup", None))
+            and callable(getattr(driver_lifespan, "shutdown", None))
+        ):
+            raise RuntimeError(
+                f"Current driver {self.config.driver} does not expose a lifespan, "
+                "asgi_webhook_app(lifespan=True) is not supported."
+            )
+        started = False
+
+        async def app(
+            scope: dict[str, Any],
+            receive: Callable[[], Awaitable[dict[str, Any]]],
+            send: Callable[..., Any],
+        ) -> None:
+            nonlocal started
+            if scope["type"] == "lifespan":
+                while True:
+                    message = await receive()
+                    if message["type"] == "lifespan.startup":
+                        if driver_lifespan is not None:
+                            try:
+                                await driver_lifespan.startup()
+                            except RuntimeError as e:
+                                # 驱动器的生命周期已由其他服务启动
+                                log("ERROR", f"Lifespan startup failed: {e}")
+                                await send(
+                                    {
+                                        "type": "lifespan.startup.failed",
+                                        "message": str(e),
+                                    }
+                                )
+                                return
+                            started = True
+                        await send({"type": "lifespan.startup.complete"})
+                    elif message["type"] == "lifespan.shutdown":
+                        if started:
+                            await driver_lifespan.shutdown()  # type: ignore
+                            started = False
+                        await send({"type": "lifespan.shutdown.complete"})
+                        return
+            if scope["type"] != "http":
+                return
+
+            path: str = scope["path"]
+            user_id = path[len(prefix) :] if path.startswith(prefix) else ""
+            if not user_id or "/" in user_id:
+                response = Response(404, content=b"Not Found")
+            elif scope["method"] != "POST":
+                response = Response(405, content=b"Method Not Allowed")
+            else:
+                chunks: list[bytes] = []
+                more_body = True
+                while more_body:
+                    message = await receive()
+                    chunks.append(message.get("body", b""))
+                    more_body = message.get("more_body", False)
+                body = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+                request = Request(
+                    "POST",
+                    URL(path),
+                    headers=[
+                        (key.decode("latin-1"), value.decode("latin-1"))
+                        for key, value in scope["headers"]
+                    ],
+                    content=body,
+                )
+                response = await self._handle_webhook(request, user_id)
+
+            content = response.content or b""
+            if isinstance(content, str):
+                content = content.encode()
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": response.status_code,
+                    "headers": [
+                        (key.lower().encode("latin-1"), value.encode("latin-1"))
+                        for key, value in response.headers.items()
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": content})
+
+        return app
+
+    async def _dispatch_webhook(
+        self, user_id: str, event: OrderNotifyEvent
+    ) -> Response:
+        """分发 Webhook 事件；ingest 模式下主进程不可达或拒绝时返回 503，由爱发电重试"""
+        try:
+            await self._dispatch(user_id, event)
+        except NetworkError as e:
+            log("ERROR", f"Webhook dispatch failed: {escape_tag(repr(e))}")
+            return WEBHOOK_RESPONSES["upstream_unavailable"]
+        return WEBHOOK_RESPONSES["success"]
+
+    async def _dispatch(self, user_id: str, event: OrderNotifyEvent) -> None:
+        """
+        将订单事件转换为对应的子类后交给 Bot 处理，开启对账时跳过已送达的重复订单，
+        未被事件过滤器接受的事件不会交给 Bot；ingest 模式下转交主进程，并等待主进程确认
+
+        :param user_id: Bot 用户 ID
+        :param event: 订单事件
+        """
+        if self._ingest_client:
+            await self._ingest_client.send(user_id, event)
+            return
+        if (bot := self.bots.get(user_id)) is None:
+            log("WARNING", f"Bot {escape_tag(user_id)} not connected, event dropped.")
+            return
+        out_trade_no = event.data.order.out_trade_no
+        if out_trade_no != TEST_OUT_TRADE_NO:
+            if reconciler := self.reconcilers.get(user_id):
+                if out_trade_no in reconciler.seen:
+                    log("DEBUG", f"Order {escape_tag(out_trade_no)} already delivered.")
+                    return
+                reconciler.mark_delivered(out_trade_no)
+            await self.export_orders(user_id, [event.data.order], "webhook")
+        event = event.specialize()
+        if not self._accepts(event):
+            log("DEBUG", f"Order {escape_tag(out_trade_no)} filtered out.")
+            return
+        asyncio.create_task(cast(Bot, bot).handle_event(event))
+
+    def add_event_filter(self, predicate: EventFilter) -> EventFilter:
+        """
+        添加事件过滤器，可作为装饰器使用
+
+        添加过滤器后，只有至少被一个过滤器接受的事件才会交给 Bot 处理，
+        其余事件在进入 handle_event 前丢弃（仍会记录已送达与导出）
+
+        :param predicate: 接收子类化后的订单事件，返回 True 表示需要该事件
+        :return: predicate 本身
+        """
+        self.event_filters.append(predicate)
+        return predicate
+
+    def remove_event_filter(self, predicate: EventFilter) -> None:
+        """移除事件过滤器"""
+        self.event_filters.remove(predicate)
+
+    def _accepts(self, event: OrderNotifyEvent) -> bool:
+        if not self.event_filters:
+            return True
+        for predicate in self.event_filters:
+            try:
+                if predicate(event):
+                    return True
+            except Exception as e:
+                # 过滤器出错时保留事件，避免丢单
+                log(
+                    "ERROR",
+                    f"Event filter {escape_tag(repr(predicate))} failed: "
+                    f"{escape_tag(repr(e))}",
+                )
+                return True
+        return False
+
+    def add_exporter(self, sink: "Sink", **kwargs: Any) -> "ExportPipeline":
+        """
+        添加订单导出目标，Webhook 订单与 API 查询到的订单页都会批量写入
+
+        :param sink: 导出目标，如 JSONLSink、ParquetSink
+        :param kwargs: ExportPipeline 的其他参数
+        :return: 导出管道
+        """
+        from .export import ExportPipeline
+
+        pipeline = ExportPipeline(sink, **kwargs)
+        self.exporters.append(pipeline)
+        return pipeline
+
+    async def export_orders(
+        self, bot_id: str, orders: Iterable[Order], source: str
+    ) -> None:
+        """
+        将订单写入所有导出管道，导出缓慢时会等待
+
+        :param bot_id: Bot 用户 ID
+        :param orders: 订单
+        :param source: 来源，webhook 或 api
+        """
+        if not self.exporters:
+            return
+        orders = list(orders)
+        for pipeline in self.exporters:
+            await pipeline.put_orders(bot_id, orders, source)
+
+    async def _cancel_tasks(self) -> None:
+        """取消健康检查、对账、配置监视与熔断探测等后台循环"""
+        if self.health:
+            await self.health.close()
+        tasks = [*self.tasks, *self._reconcile_tasks.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.tasks.clear()
+        self._reconcile_tasks.clear()
+
+    async def _close_exporters(self) -> None:
+        for pipeline in self.exporters:
+            await pipeline.close()
+
+    def set_cache_backend(self, backend: "CacheBackend | None") -> None:
+        """
+        设置 API 结果缓存，多个进程使用同一缓存时共享查询结果，传入 None 关闭缓存
+
+        :param backend: 缓存，如 SQLiteCache 或自定义的 CacheBackend
+        """
+        self.cache = backend
+
+    def _cache_key(self, key: str) -> str:
+        """以 API 地址区分缓存键，避免桩服务等其他上游的结果混入"""
+        return f"{self.afdian_config.afdian_api_base}|{key}"
+
+    async def _cache_get(self, key: str) -> bytes | None:
+        """读取缓存，缓存不可用时视为未命中"""
+        if self.cache is None:
+            return None
+        try:
+            return await self.cache.get(self._cache_key(key))
+        except Exception as e:
+            log("WARNING", f"Cache get failed: {escape_tag(repr(e))}")
+            return None
+
+    async def _cache_set(self, key: str, value: bytes, ttl: float) -> None:
+        """写入缓存，失败时只记录日志"""
+        if self.cache is None:
+            return
+        try:
+            await self.cache.set(self._cache_key(key), value, ttl)
+        except Exception as e:
+            log("WARNING", f"Cache set failed: {escape_tag(repr(e))}")
+
+    async def _close_cache(self) -> None:
+        if self.cache is not None:
+            await self.cache.close()
+
+    async def _handle_ingest(
+        self, user_id: str, data: dict[str, Any], verified: bool
+    ) -> None:
+        """
+        主进程处理 ingest 进程转交的事件
+
+        :raises NetworkError: Bot 未连接或已移除，拒绝该事件，ingest 进程随之让爱发电重试
+        """
+        if user_id not in self.bot_infos or user_id not in self.bots:
+            raise NetworkError(f"Bot {user_id} not connected")
+        event = type_validate_python(OrderNotifyEvent, data)
+        event._verified = verified
+        await self._dispatch(user_id, event)
+
+    async def _verify_order(
+        self, user_id: str, token: str, out_trade_no: str
+    ) -> str | None:
+        """
+        通过 API 验证订单是否真实存在
+
+        :param user_id: Bot 用户 ID
+        :param token: Bot Token
+        :param out_trade_no: 订单号
+        :return: 验证通过返回 None，否则返回 WEBHOOK_RESPONSES 中对应的结果
+        :raises CircuitBreakerOpen: 上游熔断中
+        """
+        # 只缓存验证通过的结果，订单存在后不会再变为不存在
+        cache_key = f"verify:{user_id}:{out_trade_no}"
+        if await self._cache_get(cache_key) is not None:
+            return None
+
+        bot = self.bots.get(user_id)
+        if isinstance(bot, TokenBot) and bot.token == token:
+            signer = bot.signer
+        elif self._ingest_client:
+            # ingest 进程不持有 Bot，为每个 Bot 缓存签名器
+            signer = self._signers.get(user_id)
+            if signer is None or signer.token != token:
+                signer = self._signers[user_id] = Signer(user_id, token)
+        else:
+            signer = Signer(user_id, token)
+        verify_request = signer.construct_request(
             self.afdian_config.afdian_api_base + "/api/open/query-order",
-            user_id,
-            token,
-            {"out_trade_no": event.data.order.out_trade_no},
+            {"out_trade_no": out_trade_no},
         )
-        verify_response: Response = await self.request(verify_request)
+        verify_response = await self.upstream_request(verify_request)
 
         # 请求失败
         if verify_response.status_code != 200:
@@ -149,11 +599,7 @@ class Adapter(BaseAdapter):
                 "ERROR",
                 f"Webhook data request failed when verify: {verify_response.content}",
             )
-            return Response(
-                400,
-                headers={"Content-Type": "application/json"},
-                content='{"ec": 400, "em": "Webhook data request failed when verify"}',
-            )
+            return "verify_request_failed"
 
         try:
             verify_order: OrderResponse = parse_response(verify_response, OrderResponse)
@@ -162,41 +608,183 @@ class Adapter(BaseAdapter):
                 "ERROR",
                 f"Webhook data request failed when verify, status={e.status_code} code={getattr(e, 'code', None)} message={getattr(e, 'message', None)}",
             )
-            return Response(
-                400,
-                headers={"Content-Type": "application/json"},
-                content='{"ec": 400, "em": "Webhook data request failed when verify"}',
-            )
+            return "verify_request_failed"
 
         # 订单列表为空，代表订单不存在，验证失败
         if not verify_order.data.list:
             log("ERROR", "Webhook data <y>list</y> is <r>empty</r>! Verify failed.")
-            return Response(
-                400,
-                headers={"Content-Type": "application/json"},
-                content='{"ec": 400, "em": "order list is empty"}',
-            )
+            return "order_list_empty"
 
         # 订单列表不为空，但不一定有需要的数据
-        for order in verify_order.data.list:
-            if order.out_trade_no == event.data.order.out_trade_no:
-                bot = cast(Bot, self.bots[user_id])
-                asyncio.create_task(bot.handle_event(event))
-                return Response(
-                    200,
-                    headers={"Content-Type": "application/json"},
-                    content='{"ec": 200, "em": "success"}',
-                )
+        if any(order.out_trade_no == out_trade_no for order in verify_order.data.list):
+            await self._cache_set(
+                cache_key, b"1", self.afdian_config.afdian_cache_verify_ttl
+            )
+            return None
+        log(
+            "ERROR",
+            "Webhook data <y>out_trade_no</y> not found in <y>list</y>! Verify failed.",
+        )
+        return "order_not_found"
+
+    async def _handle_breaker_open(
+        self, user_id: str, event: OrderNotifyEvent
+    ) -> Response:
+        """上游熔断或 Bot 不可用时按 afdian_breaker_policy 处理 Webhook"""
+        policy = self.afdian_config.afdian_breaker_policy
+        out_trade_no = escape_tag(event.data.order.out_trade_no)
+        if policy == "quarantine":
+            if len(self.quarantine) >= self.afdian_config.afdian_quarantine_size:
+                # 队列已满时拒绝，由爱发电重试，不能返回成功后再丢弃
+                log("ERROR", f"Quarantine full, order {out_trade_no} rejected.")
+                return WEBHOOK_RESPONSES["upstream_unavailable"]
+            self.quarantine.append((user_id, event))
+            log("WARNING", f"Upstream unavailable, order {out_trade_no} quarantined.")
+        elif policy == "dispatch" and (
+            self._ingest_client is not None or user_id in self.bots
+        ):
+            log(
+                "WARNING",
+                f"Upstream unavailable, order {out_trade_no} dispatched unverified.",
+            )
+            return await self._dispatch_webhook(user_id, event)
         else:
+            # reject 策略，或 Bot 未连接、dispatch 无法送达
+            log("WARNING", f"Upstream unavailable, order {out_trade_no} rejected.")
+            return WEBHOOK_RESPONSES["upstream_unavailable"]
+        return WEBHOOK_RESPONSES["success"]
+
+    async def upstream_request(self, request: Request) -> Response:
+        """
+        经过熔断器向爱发电发送请求
+
+        :param request: 请求对象
+        :return: 响应对象
+        :raises CircuitBreakerOpen: 上游熔断中，请求未发出
+        """
+        probing = self.breaker.state is BreakerState.HALF_OPEN
+        if not self.breaker.allow():
+            raise CircuitBreakerOpen("afdian upstream circuit is open")
+        start = time.perf_counter()
+        try:
+            response = await self.request(request)
+        except asyncio.CancelledError:
+            # 被取消的请求没有结果，释放探测名额，否则熔断器会一直停留在半开状态
+            if probing:
+                self.breaker.release_probe()
+            raise
+        except Exception:
+            self._record_upstream(time.perf_counter() - start, ok=False)
+            raise
+        self._record_upstream(
+            time.perf_counter() - start,
+            ok=response.status_code < 500 and response.status_code != 429,
+        )
+        return response
+
+    def _record_upstream(self, latency: float, ok: bool) -> None:
+        previous = self.breaker.state
+        self.breaker.record(latency, ok)
+        state = self.breaker.state
+        if state is previous:
+            return
+        if state is BreakerState.OPEN:
             log(
-                "ERROR",
-                "Webhook data <y>out_trade_no</y> not found in <y>list</y>! Verify failed.",
+                "WARNING",
+                f"Upstream circuit <r>opened</r>, metrics: {self.breaker.metrics()}",
             )
-            return Response(
-                400,
-                headers={"Content-Type": "application/json"},
-                content='{"ec": 400, "em": "order not found when verify"}',
+            if self._probe_task is None or self._probe_task.done():
+                self._probe_task = asyncio.create_task(self._probe_upstream())
+                self.tasks.append(self._probe_task)
+        elif state is BreakerState.CLOSED:
+            log("INFO", "Upstream circuit <g>closed</g>.")
+            if self.quarantine:
+                self.tasks.append(asyncio.create_task(self._drain_quarantine()))
+
+    async def _probe_upstream(self) -> None:
+        """熔断后等待 recovery_timeout，随后半开并用 send_ping 探测，失败则继续熔断"""
+        while self.breaker.state is BreakerState.OPEN:
+            await asyncio.sleep(self.breaker.recovery_timeout)
+            self.breaker.half_open()
+            bot = next(
+                (bot for bot in self.bots.values() if isinstance(bot, TokenBot)), None
             )
+            if bot is None:
+                # 没有可用于探测的 Bot，由下一个上游请求充当探测
+                return
+            try:
+                await bot.send_ping()
+            except Exception as e:
+                log("WARNING", f"Upstream probe failed: {escape_tag(repr(e))}")
+
+    async def _drain_quarantine(self) -> None:
+        """
+        上游或 Bot 恢复后重新验证隔离队列中的事件
+
+        仍不健康的 Bot 的事件与验证请求失败的事件保留在队列中等待下次重新验证，
+        验证未通过或无法分发的事件丢弃，记录日志并计入 quarantine_dropped
+        """
+        retained: list[tuple[str, OrderNotifyEvent]] = []
+        while self.quarantine and self.breaker.state is BreakerState.CLOSED:
+            user_id, event = self.quarantine.popleft()
+            out_trade_no = escape_tag(event.data.order.out_trade_no)
+            bot_info = self.bot_infos.get(user_id)
+            if bot_info is None or not bot_info.token:
+                self._drop_quarantined(out_trade_no, "bot removed")
+                continue
+            if self._bot_unavailable(user_id):
+                retained.append((user_id, event))
+                continue
+            try:
+                error = await self._verify_order(
+                    user_id, bot_info.token, event.data.order.out_trade_no
+                )
+            except CircuitBreakerOpen:
+                self.quarantine.appendleft((user_id, event))
+                break
+            except Exception as e:
+                error = "verify_request_failed"
+                log("ERROR", f"Quarantined order verify failed: {escape_tag(repr(e))}")
+            if error == "verify_request_failed":
+                log("WARNING", f"Quarantined order {out_trade_no} kept for retry.")
+                retained.append((user_id, event))
+                continue
+            if error:
+                self._drop_quarantined(out_trade_no, error)
+                continue
+            event._verified = True
+            try:
+                await self._dispatch(user_id, event)
+            except NetworkError as e:
+                # ingest 模式下主进程暂时无法接收，保留等待下次重新验证
+                log(
+                    "WARNING",
+                    f"Quarantined order {out_trade_no} kept for retry: "
+                    f"{escape_tag(repr(e))}",
+                )
+                retained.append((user_id, event))
+            except Exception as e:
+                self._drop_quarantined(out_trade_no, repr(e))
+        self.quarantine.extend(retained)
+
+    def _bot_unavailable(self, user_id: str) -> bool:
+        """Bot 未连接，或最近一次健康检查失败"""
+        if self._ingest_client is None and user_id not in self.bots:
+            return True
+        return self.health is not None and self.health.is_degraded(user_id)
+
+    def _drop_quarantined(self, out_trade_no: str, reason: str) -> None:
+        self.quarantine_dropped += 1
+        log(
+            "ERROR",
+            f"Quarantined order {out_trade_no} dropped: {escape_tag(reason)}, "
+            f"total dropped={self.quarantine_dropped}",
+        )
+
+    def _on_bot_recovered(self, user_id: str) -> None:
+        """健康检查发现 Bot 恢复"""
+        if self.quarantine and self.breaker.state is BreakerState.CLOSED:
+            self.tasks.append(asyncio.create_task(self._drain_quarantine()))
 
     @override
     async def _call_api(self, bot: Bot, api: str, **data: Any) -> Any:
@@ -208,25 +796,146 @@ class Adapter(BaseAdapter):
             log("ERROR", f"Unsupported api: {api}")
             raise ApiNotAvailable(api)
 
+    @override
+    def bot_connect(self, bot: Bot) -> None:
+        super().bot_connect(bot)
+        if isinstance(bot, TokenBot) and self.afdian_config.afdian_reconcile:
+            from .reconcile import Reconciler
+
+            reconciler = self.reconcilers.get(bot.self_id)
+            if reconciler is None:
+                reconciler = Reconciler(
+                    bot,
+                    self._dispatch,
+                    min_interval=self.afdian_config.afdian_reconcile_min_interval,
+                    max_interval=self.afdian_config.afdian_reconcile_max_interval,
+                    max_pages=self.afdian_config.afdian_reconcile_max_pages,
+                    lookback=self.afdian_config.afdian_reconcile_lookback,
+                    started_at=self._started_at,
+                )
+                self.reconcilers[bot.self_id] = reconciler
+            else:
+                # 重连后沿用原对账器，断开期间的订单会作为漏推订单补发
+                reconciler.bot = bot
+            if task := self._reconcile_tasks.pop(bot.self_id, None):
+                task.cancel()
+            self._reconcile_tasks[bot.self_id] = asyncio.create_task(reconciler.run())
+
+    @override
+    def bot_disconnect(self, bot: Bot) -> None:
+        if task := self._reconcile_tasks.pop(bot.self_id, None):
+            task.cancel()
+        super().bot_disconnect(bot)
+
     async def add_bot(self, bot_info: BotInfo) -> Bot | None:
         """
         在适配器中新增一个Bot
         :param bot_info: Bot信息
         :return: Bot 实例，连接失败则返回 None
         """
+        self.bot_infos[bot_info.user_id] = bot_info
         if bot := await self._connect_bot(bot_info):
-            webhook_route = HTTPServerSetup(
-                URL("/afdian/webhooks/" + bot_info.user_id),
-                "POST",
-                self.get_name(),
-                partial(
-                    self._handle_webhook, user_id=bot_info.user_id, token=bot_info.token
-                ),
-            )
-            self.setup_http_server(webhook_route)
+            self._setup_route(bot_info.user_id)
+            if self.health:
+                self.health.watch(bot_info.user_id)
             return bot
+        if self.bot_infos.get(bot_info.user_id) is bot_info:
+            self.bot_infos.pop(bot_info.user_id)
         return None
 
+    def remove_bot(self, user_id: str) -> None:
+        """
+        从适配器中移除一个Bot，其 Webhook 路由此后返回 404
+        :param user_id: Bot 用户 ID
+        """
+        self.bot_infos.pop(user_id, None)
+        self._signers.pop(user_id, None)
+        if self.health:
+            self.health.unwatch(user_id)
+        if bot := self.bots.get(user_id):
+            self.bot_disconnect(bot)
+            log("INFO", f"<y>Bot {escape_tag(user_id)}</y> removed")
+        self.reconcilers.pop(user_id, None)
+
+    def reload_bots(self, bot_infos: Iterable[BotInfo]) -> None:
+        """
+        按差异应用新的 Bot 配置：连接新增的 Bot、移除已删除的 Bot、原地替换 Token，
+        未变化的 Bot 不受影响
+
+        :param bot_infos: 新的完整 Bot 配置
+        """
+        new_infos = {bot_info.user_id: bot_info for bot_info in bot_infos}
+        for user_id in self.bot_infos.keys() - new_infos.keys():
+            self.remove_bot(user_id)
+
+        for user_id, bot_info in new_infos.items():
+            old_info = self.bot_infos.get(user_id)
+            if old_info is not None and old_info.token == bot_info.token:
+                continue
+            self.bot_infos[user_id] = bot_info
+            self._setup_route(user_id)
+            bot = self.bots.get(user_id)
+            if (
+                old_info is not None
+                and old_info.token
+                and bot_info.token
+                and isinstance(bot, TokenBot)
+            ):
+                bot.token = bot_info.token
+                log("INFO", f"<y>Bot {escape_tag(user_id)}</y> token updated")
+                continue
+            # 新增 Bot，或在 HookBot / TokenBot 之间切换
+            if bot is not None:
+                self.bot_disconnect(bot)
+            self._start_bot(bot_info)
+
+    def watch_bots(
+        self,
+        source: Callable[[], Awaitable[Iterable[BotInfo] | None]],
+        interval: float = 5.0,
+    ) -> asyncio.Task:
+        """
+        定时从配置源读取 Bot 配置并热重载
+
+        :param source: 异步配置源，返回 None 表示配置未变化
+        :param interval: 读取间隔（秒）
+        :return: 后台任务
+        """
+
+        async def _watch():
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    bot_infos = await source()
+                except Exception as e:
+                    log("ERROR", f"Load bots config failed: {escape_tag(repr(e))}")
+                    continue
+                if bot_infos is not None:
+                    self.reload_bots(bot_infos)
+
+        task = asyncio.create_task(_watch())
+        self.tasks.append(task)
+        return task
+
+    @staticmethod
+    def _bots_file_source(
+        path: Path,
+    ) -> Callable[[], Awaitable[list[BotInfo] | None]]:
+        """以 JSON 文件作为配置源，格式同 AFDIAN_BOTS，文件修改时间变化时才重新读取"""
+        mtime: float | None = None
+
+        async def _load() -> list[BotInfo] | None:
+            nonlocal mtime
+            stat = await asyncio.to_thread(path.stat)
+            if stat.st_mtime == mtime:
+                return None
+            text = await asyncio.to_thread(path.read_text, encoding="utf-8")
+            bot_infos = type_validate_python(list[BotInfo], json.loads(text))
+            mtime = stat.st_mtime
+            return bot_infos
+
+        return _load
+
     async def _connect_bot(self, bot_info: BotInfo) -> TokenBot | None:
         assert bot_info.token
         request = construct_request(
@@ -235,7 +944,14 @@ class Adapter(BaseAdapter):
             bot_info.token,
             params={"a": 333},
         )
-        response = await self.request(request)
+        try:
+            response = await self.upstream_request(request)
+        except CircuitBreakerOpen:
+            log(
+                "ERROR",
+                f"<y>Bot {bot_info.user_id}</y> connect <r>failed</r>, upstream circuit is open",
+            )
+            return None
         try:
             ping = parse_response(response, PingResponse)
             if ping.ec != 200:
@@ -257,6 +973,18 @@ class Adapter(BaseAdapter):
                 )
             return None
 
+        # 连接期间配置可能已被热重载移除或替换 Token，此时放弃本次连接结果
+        current = self.bot_infos.get(bot_info.user_id)
+        if current is None or current.token != bot_info.token:
+            log(
+                "INFO",
+                f"<y>Bot {escape_tag(bot_info.user_id)}</y> config changed while "
+                "connecting, discarded",
+            )
+            return None
+        if isinstance(existing := self.bots.get(bot_info.user_id), TokenBot):
+            # 已由另一次连接连上
+            return existing
         bot = TokenBot(self, self_id=bot_info.user_id, token=bot_info.token)
         self.bot_connect(bot)
         log("INFO", f"<y>Bot {escape_tag(bot_info.user_id)}</y> connected")
@@ -0,0 +1,197 @@
+from array import array
+from collections import defaultdict
+from collections.abc import Iterable
+import time
+from typing import TYPE_CHECKING
+
+from .payload import Order
+
+if TYPE_CHECKING:
+    from .sponsor import SponsorList
+
+MONTH_SECONDS = 30 * 24 * 3600
+"""按 30 天计算一个赞助月"""
+
+
+def parse_cents(amount: str | None) -> int:
+    """将爱发电的金额字符串（如 "5.00"）解析为以分为单位的整数"""
+    if not amount:
+        return 0
+    sign = 1
+    if amount[0] == "-":
+        sign, amount = -1, amount[1:]
+    whole, _, frac = amount.partition(".")
+    return sign * (int(whole or 0) * 100 + int((frac + "00")[:2]))
+
+
+class _Index:
+    """字符串到整数编号的字典编码"""
+
+    def __init__(self):
+        self.values: list[str] = []
+        self._index: dict[str, int] = {}
+
+    def __call__(self, value: str) -> int:
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+
+class OrderTable:
+    """订单列式表
+
+    金额在构建时一次性解析为分，方案与用户以整数编号存储，聚合时不再访问 pydantic 对象。
+    没有 create_time 的订单（如 Webhook 推送）按 0 存储，不计入按时间的统计。
+    """
+
+    def __init__(self):
+        self.create_time = array("q")
+        self.total_cents = array("q")
+        self.show_cents = array("q")
+        self.month = array("l")
+        self.plan = array("l")
+        self.user = array("l")
+        self._plans = _Index()
+        self._users = _Index()
+
+    @classmethod
+    def from_orders(cls, orders: Iterable[Order]) -> "OrderTable":
+        table = cls()
+        table.extend(orders)
+        return table
+
+    def extend(self, orders: Iterable[Order]) -> None:
+        """追加订单"""
+        for order in orders:
+            self.create_time.append(order.create_time or 0)
+            self.total_cents.append(parse_cents(order.total_amount))
+            self.show_cents.append(parse_cents(order.show_amount))
+            self.month.append(order.month)
+            self.plan.append(self._plans(order.plan_id))
+            self.user.append(self._users(order.user_id))
+
+    def __len__(self) -> int:
+        return len(self.total_cents)
+
+    @property
+    def plan_ids(self) -> list[str]:
+        return self._plans.values
+
+    @property
+    def user_ids(self) -> list[str]:
+        return self._users.values
+
+    def total_revenue(self) -> int:
+        """实际收入（分）"""
+        return sum(self.total_cents)
+
+    def _group_sum(self, keys: array, values: list[str]) -> dict[str, int]:
+        sums = [0] * len(values)
+        for key, cents in zip(keys, self.total_cents):
+            sums[key] += cents
+        return dict(zip(values, sums))
+
+    def revenue_by_plan(self) -> dict[str, int]:
+        """每个方案的实际收入（分），自选方案的 plan_id 为空字符串"""
+        return self._group_sum(self.plan, self.plan_ids)
+
+    def revenue_by_user(self) -> dict[str, int]:
+        """每个用户的实际收入（分）"""
+        return self._group_sum(self.user, self.user_ids)
+
+    def revenue_by_month(self, utc_offset: int = 8 * 3600) -> dict[str, int]:
+        """
+        每个自然月的实际收入（分），键为 YYYY-MM
+
+        :param utc_offset: 时区偏移（秒），默认东八区
+        """
+        by_day: defaultdict[int, int] = defaultdict(int)
+        for ts, cents in zip(self.create_time, self.total_cents):
+            if ts > 0:
+                by_day[(ts + utc_offset) // 86400] += cents
+        sums: defaultdict[str, int] = defaultdict(int)
+        for day, cents in by_day.items():
+            sums[time.strftime("%Y-%m", time.gmtime(day * 86400))] += cents
+        return dict(sorted(sums.items()))
+
+    def active_users(self, at: int) -> set[str]:
+        """在时间点 at 仍处于赞助期内的用户"""
+        users = self.user_ids
+        return {
+            users[user]
+            for ts, month, user in zip(self.create_time, self.month, self.user)
+            if 0 < ts <= at < ts + month * MONTH_SECONDS
+        }
+
+    def active_count(self, at: int) -> int:
+        """在时间点 at 仍处于赞助期内的用户数"""
+        return len(self.active_users(at))
+
+    def churn(self, start: int, end: int) -> float:
+        """
+        流失率：start 时处于赞助期内，而 end 时已不在赞助期内的用户占比
+
+        :param start: 起始时间戳
+        :param end: 结束时间戳
+        """
+        active_start = self.active_users(start)
+        if not active_start:
+            return 0.0
+        return len(active_start - self.active_users(end)) / len(active_start)
+
+
+class SponsorTable:
+    """赞助者列式表"""
+
+    def __init__(self):
+        self.all_sum_cents = array("q")
+        self.first_pay_time = array("q")
+        self.last_pay_time = array("q")
+        self.user_ids: list[str] = []
+        self.current_plans: list[str] = []
+
+    @classmethod
+    def from_sponsors(cls, sponsors: Iterable["SponsorList"]) -> "SponsorTable":
+        table = cls()
+        table.extend(sponsors)
+        return table
+
+    def extend(self, sponsors: Iterable["SponsorList"]) -> None:
+        """追加赞助者"""
+        for sponsor in sponsors:
+            self.all_sum_cents.append(parse_cents(sponsor.all_sum_amount))
+            self.first_pay_time.append(
+                sponsor.first_pay_time or sponsor.create_time or 0
+            )
+            self.last_pay_time.append(sponsor.last_pay_time)
+            self.user_ids.append(sponsor.user.user_id)
+            self.current_plans.append(sponsor.current_plan.plan_id or "")
+
+    def __len__(self) -> int:
+        return len(self.all_sum_cents)
+
+    def total_amount(self) -> int:
+        """累计赞助金额（分，折扣前）"""
+        return sum(self.all_sum_cents)
+
+    def amount_by_current_plan(self) -> dict[str, int]:
+        """按当前方案汇总累计赞助金额（分），无方案为空字符串"""
+        sums: defaultdict[str, int] = defaultdict(int)
+        for plan, cents in zip(self.current_plans, self.all_sum_cents):
+            sums[plan] += cents
+        return dict(sums)
+
+    def active_count(self, at: int, window: int = MONTH_SECONDS) -> int:
+        """
+        活跃赞助者数量：首次赞助不晚于 at，且最近一次赞助晚于 at - window
+
+        赞助者列表只有首次与最近一次赞助时间，精确的时间点统计请使用 OrderTable
+        """
+        since = at - window
+        return sum(
+            1
+            for first, last in zip(self.first_pay_time, self.last_pay_time)
+            if first <= at and last > since
+        )
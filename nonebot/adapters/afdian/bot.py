@@ -1,16 +1,20 @@
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, TypeVar
 from typing_extensions import override
 
 from nonebot.adapters import Bot as BaseBot
+from nonebot.compat import type_validate_json
 from nonebot.message import handle_event
 
 from .event import Event
 from .message import Message, MessageSegment
-from .payload import OrderResponse, PingResponse, SponsorResponse
-from .utils import construct_request, parse_response
+from .payload import BaseAfdianResponse, OrderResponse, PingResponse
+from .utils import Signer, dumps_params, parse_response
 
 if TYPE_CHECKING:
     from .adapter import Adapter
+    from .sponsor import SponsorResponse
+
+R = TypeVar("R", bound=BaseAfdianResponse)
 
 
 class Bot(BaseBot):
@@ -39,33 +43,70 @@ class TokenBot(HookBot):
     @override
     def __init__(self, adapter: "Adapter", self_id: str, token: str):
         super().__init__(adapter, self_id)
-        self.token = token
+        self.signer = Signer(self_id, token)
+        """预计算的签名上下文，替换 token 时重建"""
+
+    @property
+    def token(self) -> str:
+        return self.signer.token
+
+    @token.setter
+    def token(self, token: str) -> None:
+        self.signer = Signer(self.self_id, token)
 
     async def send_ping(self) -> PingResponse:
-        request = construct_request(
+        request = self.signer.construct_request(
             self.adapter.afdian_config.afdian_api_base + "/api/open/ping",
-            self.self_id,
-            self.token,
-            params={"a": 333},
+            {"a": 333},
         )
-        response = await self.adapter.request(request)
+        response = await self.adapter.upstream_request(request)
         return parse_response(response, PingResponse)
 
-    async def __query_order(self, params: dict[str, Any]) -> OrderResponse:
-        request = construct_request(
-            self.adapter.afdian_config.afdian_api_base + "/api/open/query-order",
-            self.self_id,
-            self.token,
-            params=params,
+    async def _call_cached_api(
+        self, api: str, params: dict[str, Any], response_model: type[R]
+    ) -> tuple[R, bool]:
+        """调用查询 API，开启缓存时优先使用缓存中的成功结果
+
+        :return: 结果，以及结果是否来自缓存
+        """
+        cache_key = f"{self.self_id}:{api}:{dumps_params(params)}"
+        if (cached := await self.adapter._cache_get(cache_key)) is not None:
+            return type_validate_json(response_model, cached), True
+        request = self.signer.construct_request(
+            self.adapter.afdian_config.afdian_api_base + api, params
         )
-        response = await self.adapter.request(request)
-        return parse_response(response, OrderResponse)
-
-    async def query_order_by_page(self, page: int) -> OrderResponse:
-        """根据页码查询订单"""
+        response = await self.adapter.upstream_request(request)
+        result = parse_response(response, response_model)
+        if self.adapter.cache is not None and result.ec == 200:
+            content = response.content
+            if isinstance(content, str):
+                content = content.encode()
+            if content:
+                await self.adapter._cache_set(
+                    cache_key, content, self.adapter.afdian_config.afdian_cache_ttl
+                )
+        return result, False
+
+    async def __query_order(
+        self, params: dict[str, Any], export: bool = True
+    ) -> OrderResponse:
+        order_response, cached = await self._call_cached_api(
+            "/api/open/query-order", params, OrderResponse
+        )
+        # 缓存中的结果已在首次查询时导出
+        if export and not cached:
+            await self.adapter.export_orders(
+                self.self_id, order_response.data.list, "api"
+            )
+        return order_response
+
+    async def query_order_by_page(
+        self, page: int, *, export: bool = True
+    ) -> OrderResponse:
+        """根据页码查询订单，export 为 False 时不写入导出管道"""
         if page <= 0:
             raise ValueError("page must be greater than 0")
-        return await self.__query_order(params={"page": page})
+        return await self.__query_order(params={"page": page}, export=export)
 
     async def query_order_by_out_trade_no(self, out_trade_no: str) -> OrderResponse:
         """根据订单号查询订单"""
@@ -76,17 +117,17 @@ class TokenBot(HookBot):
         order_list_str = ",".join(order_list)
         return await self.__query_order(params={"out_trade_no": order_list_str})
 
-    async def query_sponsor(self, page: int, per_page: int = 20) -> SponsorResponse:
+    async def query_sponsor(self, page: int, per_page: int = 20) -> "SponsorResponse":
         """查询赞助者，可选传参每页数量 1-100"""
+        from .sponsor import SponsorResponse
+
         if page <= 0:
             raise ValueError("page must be greater than 0")
         if per_page > 100 or per_page < 1:
             raise ValueError("per_page must be between 1 and 100")
-        request = construct_request(
-            self.adapter.afdian_config.afdian_api_base + "/api/open/query-sponsor",
-            self.self_id,
-            self.token,
-            params={"page": page, "per_page": per_page},
+        sponsor_response, _ = await self._call_cached_api(
+            "/api/open/query-sponsor",
+            {"page": page, "per_page": per_page},
+            SponsorResponse,
         )
-        response = await self.adapter.request(request)
-        return parse_response(response, SponsorResponse)
+        return sponsor_response
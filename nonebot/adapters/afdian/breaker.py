@@ -0,0 +1,133 @@
+from enum import Enum
+import time
+from typing import Any
+
+
+class BreakerState(str, Enum):
+    """熔断器状态"""
+
+    CLOSED = "closed"
+    """正常放行"""
+    OPEN = "open"
+    """熔断中，拒绝所有上游请求"""
+    HALF_OPEN = "half_open"
+    """半开，仅放行一个探测请求"""
+
+
+class CircuitBreaker:
+    """爱发电上游请求熔断器
+
+    连续失败（异常、5xx/429 或超过延迟阈值）达到阈值后熔断，
+    熔断期间由适配器在 recovery_timeout 后发起探测，探测成功则恢复。
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        latency_threshold: float | None = None,
+        recovery_timeout: float = 30.0,
+    ):
+        """
+        :param failure_threshold: 连续失败多少次后熔断，小于等于 0 表示不熔断
+        :param latency_threshold: 单次请求耗时超过该秒数视为失败
+        :param recovery_timeout: 熔断后多少秒开始探测
+        """
+        self.failure_threshold = failure_threshold
+        self.latency_threshold = latency_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self.state: BreakerState = BreakerState.CLOSED
+        self.consecutive_failures: int = 0
+        self.opened_at: float | None = None
+        self._probing: bool = False
+
+        self.total_successes: int = 0
+        self.total_failures: int = 0
+        self.total_slow: int = 0
+        self.total_rejected: int = 0
+        self.open_count: int = 0
+        self.last_latency: float | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.failure_threshold > 0
+
+    def allow(self) -> bool:
+        """当前是否放行一个上游请求"""
+        if self.state is BreakerState.CLOSED:
+            return True
+        if self.state is BreakerState.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        self.total_rejected += 1
+        return False
+
+    def half_open(self) -> None:
+        """进入半开状态，下一个请求将作为探测请求放行"""
+        if self.state is BreakerState.OPEN:
+            self.state = BreakerState.HALF_OPEN
+            self._probing = False
+
+    def release_probe(self) -> None:
+        """放弃已放行但未完成的探测请求（如请求被取消），下一个请求重新作为探测请求放行"""
+        if self.state is BreakerState.HALF_OPEN:
+            self._probing = False
+
+    def record(self, latency: float, ok: bool) -> None:
+        """记录一次上游请求结果
+
+        :param latency: 请求耗时（秒）
+        :param ok: 请求本身是否成功
+        """
+        self.last_latency = latency
+        if (
+            ok
+            and self.latency_threshold is not None
+            and latency > self.latency_threshold
+        ):
+            self.total_slow += 1
+            ok = False
+        if ok:
+            self.record_success()
+        else:
+            self.record_failure()
+
+    def record_success(self) -> None:
+        self.total_successes += 1
+        self.consecutive_failures = 0
+        if self.state is not BreakerState.CLOSED:
+            self.state = BreakerState.CLOSED
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        self.total_failures += 1
+        self.consecutive_failures += 1
+        if self.state is BreakerState.HALF_OPEN or (
+            self.enabled
+            and self.state is BreakerState.CLOSED
+            and self.consecutive_failures >= self.failure_threshold
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        self.state = BreakerState.OPEN
+        self.opened_at = time.monotonic()
+        self.open_count += 1
+        self._probing = False
+
+    def metrics(self) -> dict[str, Any]:
+        """熔断器指标快照"""
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self.consecutive_failures,
+            "total_successes": self.total_successes,
+            "total_failures": self.total_failures,
+            "total_slow": self.total_slow,
+            "total_rejected": self.total_rejected,
+            "open_count": self.open_count,
+            "opened_for": (
+                time.monotonic() - self.opened_at if self.opened_at is not None else 0.0
+            ),
+            "last_latency": self.last_latency,
+        }
@@ -0,0 +1,82 @@
+from abc import ABC, abstractmethod
+import asyncio
+from pathlib import Path
+import sqlite3
+import threading
+import time
+
+
+class CacheBackend(ABC):
+    """API 结果缓存
+
+    值为原始字节，键由调用方保证唯一。
+    接入 Redis、Memcached 等网络存储时继承该类并实现 get / set。
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """读取未过期的值，不存在或已过期时返回 None"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """写入值，ttl 秒后过期"""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """关闭缓存"""
+
+
+class SQLiteCache(CacheBackend):
+    """本机多进程共享的 SQLite 缓存
+
+    使用 WAL 模式，多个进程可同时读取；数据库放在 /dev/shm 等内存文件系统中时不落盘。
+    """
+
+    def __init__(self, path: str | Path, cleanup_every: int = 1000):
+        """
+        :param path: 数据库文件路径，同一机器上的进程使用同一路径即可共享
+        :param cleanup_every: 每写入多少次清理一次过期数据
+        """
+        self.path = Path(path)
+        self.cleanup_every = cleanup_every
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, timeout=5.0, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)"
+        )
+
+    async def get(self, key: str) -> bytes | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _get(self, key: str) -> bytes | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND expires > ?",
+                (key, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, value: bytes, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                (key, value, now + ttl),
+            )
+            self._writes += 1
+            if self._writes % self.cleanup_every == 0:
+                self._conn.execute("DELETE FROM cache WHERE expires <= ?", (now,))
@@ -1,3 +1,6 @@
+from pathlib import Path
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -10,3 +13,45 @@ class Config(BaseModel):
     afdian_bots: list[BotInfo] = Field(default_factory=list)
     afdian_api_base: str = Field("https://afdian.com")
     afdian_hook_secret: str = Field("")
+    afdian_bots_file: Path | None = Field(None)
+    """Bot 配置文件，格式同 afdian_bots，修改后自动热重载"""
+    afdian_bots_reload_interval: float = Field(5.0)
+    """检查 Bot 配置文件变化的间隔（秒）"""
+    afdian_ingest_mode: Literal["standalone", "host", "ingest"] = Field("standalone")
+    """多进程部署模式：host 持有 Bot 并接收事件，ingest 只接收与验证 Webhook 并转交 host"""
+    afdian_ingest_socket: str = Field("afdian_ingest.sock")
+    """host 与 ingest 进程通信的 Unix Socket 路径"""
+    afdian_record_path: Path | None = Field(None)
+    """记录收到的 Webhook 原始请求体与时间，用于回放"""
+    afdian_cache_path: Path | None = Field(None)
+    """SQLite 缓存文件路径，多个进程使用同一路径时共享 API 查询结果"""
+    afdian_cache_ttl: float = Field(60.0)
+    """订单与赞助者查询结果的缓存时间（秒）"""
+    afdian_cache_verify_ttl: float = Field(86400.0)
+    """订单验证通过结果的缓存时间（秒）"""
+    afdian_reconcile: bool = Field(False)
+    """是否定时查询订单，补发 Webhook 漏推的订单"""
+    afdian_reconcile_min_interval: float = Field(60.0)
+    """对账最小间隔（秒），有新订单后使用"""
+    afdian_reconcile_max_interval: float = Field(1800.0)
+    """对账最大间隔（秒），空闲时间隔逐步翻倍至此"""
+    afdian_reconcile_max_pages: int = Field(3)
+    """每次对账最多查询的订单页数"""
+    afdian_reconcile_lookback: float = Field(0.0)
+    """首次对账时补发启动前多少秒内创建的订单"""
+    afdian_health_interval: float = Field(0.0)
+    """TokenBot 健康时的 ping 间隔（秒），0 表示关闭健康检查（默认），建议 600"""
+    afdian_health_retry_interval: float = Field(30.0)
+    """健康检查失败后的首次重试间隔（秒），此后逐次翻倍"""
+    afdian_health_disconnect_after: int = Field(3)
+    """连续失败多少次后断开 Bot 并定时重连"""
+    afdian_breaker_failure_threshold: int = Field(5)
+    """上游连续失败多少次后熔断，0 表示关闭熔断"""
+    afdian_breaker_latency_threshold: float | None = Field(None)
+    """上游请求耗时超过该秒数视为失败"""
+    afdian_breaker_recovery_timeout: float = Field(30.0)
+    """熔断后多少秒使用 ping 探测恢复"""
+    afdian_breaker_policy: Literal["reject", "quarantine", "dispatch"] = Field("reject")
+    """熔断期间 Webhook 的处理策略：快速拒绝、放入隔离队列待恢复后验证、不验证直接分发"""
+    afdian_quarantine_size: int = Field(1000)
+    """隔离队列最大长度，已满时新的 Webhook 返回 503"""
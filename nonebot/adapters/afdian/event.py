@@ -1,11 +1,22 @@
+from copy import copy
+from decimal import Decimal
+from functools import lru_cache
 from typing_extensions import override
 
+from pydantic import PrivateAttr
+
 from nonebot.adapters import Event as BaseEvent
 from nonebot.compat import model_dump
 from nonebot.utils import escape_tag
 
 from .message import Message
-from .payload import WebhookData
+from .payload import Order, WebhookData
+
+
+@lru_cache(maxsize=1024)
+def parse_amount(amount: str) -> Decimal:
+    """解析金额字符串，相同金额共享同一个 Decimal"""
+    return Decimal(amount or "0")
 
 
 class Event(BaseEvent):
@@ -51,6 +62,16 @@ class OrderNotifyEvent(Event):
     """Order Notify Event"""
 
     data: WebhookData
+    _verified: bool = PrivateAttr(False)
+
+    @property
+    def verified(self) -> bool:
+        """
+        订单是否已通过 API 验证，由适配器设置，不从 Webhook 请求体读取
+
+        测试订单、无 Token 的 HookBot 收到的订单与熔断期间以 dispatch 策略分发的订单为 False
+        """
+        return self._verified
 
     @override
     def get_type(self) -> str:
@@ -77,8 +98,55 @@ class OrderNotifyEvent(Event):
     def get_order_id(self):
         return self.data.order.out_trade_no
 
+    @property
+    def amount(self) -> Decimal:
+        """真实付款金额"""
+        return parse_amount(self.data.order.total_amount)
+
+    @property
+    def show_amount(self) -> Decimal:
+        """显示金额，折扣前"""
+        return parse_amount(self.data.order.show_amount)
+
+    @property
+    def plan_id(self) -> str | None:
+        """方案 ID，自选金额时为 None"""
+        return self.data.order.plan_id or None
+
     @override
     def get_event_description(self) -> str:
         return (
             f"Order {self.data.order.out_trade_no} from user @{self.data.order.user_id}"
         )
+
+    def specialize(self) -> "OrderNotifyEvent":
+        """按订单类型转换为对应的子类事件，已是对应类型时返回自身"""
+        event_class = order_event_class(self.data.order)
+        if type(self) is event_class:
+            return self
+        # 子类没有新增字段，浅拷贝后替换类型，保留额外字段与私有属性且不重新校验
+        event = copy(self)
+        # pydantic v1 的 __setattr__ 会把 __class__ 当作额外字段存储，需绕过
+        object.__setattr__(event, "__class__", event_class)
+        return event
+
+
+class SponsorshipOrderEvent(OrderNotifyEvent):
+    """常规赞助方案订单"""
+
+
+class ProductOrderEvent(OrderNotifyEvent):
+    """售卖方案订单"""
+
+
+class RedeemOrderEvent(OrderNotifyEvent):
+    """兑换码订单"""
+
+
+def order_event_class(order: Order) -> type[OrderNotifyEvent]:
+    """根据 redeem_id / product_type 判断订单对应的事件类型"""
+    if order.redeem_id:
+        return RedeemOrderEvent
+    if order.product_type == 1:
+        return ProductOrderEvent
+    return SponsorshipOrderEvent
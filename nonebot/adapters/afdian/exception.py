@@ -26,6 +26,13 @@ class NetworkError(BaseNetworkError, AfdianAdapterException):
         return self.__repr__()
 
 
+class CircuitBreakerOpen(NetworkError):
+    """上游熔断中，请求未发出"""
+
+    def __repr__(self):
+        return f"<CircuitBreakerOpen message={self.msg}>"
+
+
 class ActionFailed(
     BaseActionFailed,
     AfdianAdapterException,
@@ -0,0 +1,194 @@
+from abc import ABC, abstractmethod
+import asyncio
+from collections.abc import Iterable
+import json
+from pathlib import Path
+import time
+from typing import Any
+
+from nonebot.compat import model_dump
+from nonebot.utils import escape_tag
+
+from .payload import Order
+from .utils import log
+
+
+class Sink(ABC):
+    """导出目标，批量写入订单记录"""
+
+    @abstractmethod
+    async def write(self, records: list[dict[str, Any]]) -> None:
+        """写入一批记录"""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """关闭导出目标"""
+
+
+class JSONLSink(Sink):
+    """按大小轮转的 JSONL 文件"""
+
+    def __init__(self, path: str | Path, max_bytes: int = 64 * 1024 * 1024):
+        """
+        :param path: 文件路径，轮转后的文件在其后追加时间戳
+        :param max_bytes: 单个文件超过该大小后轮转，0 表示不轮转
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+
+    async def write(self, records: list[dict[str, Any]]) -> None:
+        await asyncio.to_thread(self._write, records)
+
+    def _write(self, records: list[dict[str, Any]]) -> None:
+        if (
+            self.max_bytes
+            and self.path.exists()
+            and self.path.stat().st_size >= self.max_bytes
+        ):
+            self.path.rename(self.path.with_name(f"{self.path.name}.{time.time_ns()}"))
+        data = "".join(
+            json.dumps(record, ensure_ascii=False) + "\n" for record in records
+        )
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(data)
+
+
+class ParquetSink(Sink):
+    """列式 Parquet 文件，每批写入一个文件，需要安装 pyarrow"""
+
+    def __init__(self, directory: str | Path, prefix: str = "orders"):
+        """
+        :param directory: 输出目录
+        :param prefix: 文件名前缀
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                "ParquetSink requires pyarrow, please install it first: "
+                "pip install pyarrow"
+            ) from e
+        self._pa = pa
+        self._pq = pq
+        self.directory = Path(directory)
+        self.prefix = prefix
+
+    async def write(self, records: list[dict[str, Any]]) -> None:
+        await asyncio.to_thread(self._write, records)
+
+    def _write(self, records: list[dict[str, Any]]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        table = self._pa.Table.from_pylist(records)
+        self._pq.write_table(
+            table, self.directory / f"{self.prefix}-{time.time_ns()}.parquet"
+        )
+
+
+class ExportPipeline:
+    """订单导出管道
+
+    缓冲记录，按数量或时间批量写入 Sink。
+    缓冲区满时 put 会等待，使写入缓慢的 Sink 对上游形成背压。
+    """
+
+    def __init__(
+        self,
+        sink: Sink,
+        batch_size: int = 500,
+        flush_interval: float = 5.0,
+        max_pending: int = 10000,
+        max_retries: int = 3,
+    ):
+        """
+        :param sink: 导出目标
+        :param batch_size: 每批最多写入的记录数
+        :param flush_interval: 最长等待多少秒写入一批
+        :param max_pending: 缓冲区最多容纳的记录数
+        :param max_retries: 写入失败时的重试次数，仍失败则丢弃该批并记录日志
+        """
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue(max_pending)
+        self.exported: int = 0
+        self.dropped: int = 0
+        self._task: asyncio.Task | None = None
+
+    async def put(self, record: dict[str, Any]) -> None:
+        """放入一条记录，缓冲区满时等待"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        await self.queue.put(record)
+
+    async def put_orders(
+        self, bot_id: str, orders: Iterable[Order], source: str
+    ) -> None:
+        """
+        放入订单记录
+
+        :param bot_id: Bot 用户 ID
+        :param orders: 订单
+        :param source: 来源，webhook 或 api
+        """
+        exported_at = int(time.time())
+        for order in orders:
+            await self.put(
+                {
+                    "bot_id": bot_id,
+                    "source": source,
+                    "exported_at": exported_at,
+                    **model_dump(order),
+                }
+            )
+
+    async def close(self) -> None:
+        """写入剩余记录并关闭 Sink"""
+        if self._task is not None:
+            await self.queue.put(None)
+            await self._task
+            self._task = None
+        await self.sink.close()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        closing = False
+        while not closing:
+            batch: list[dict[str, Any]] = []
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    if self.queue.empty():
+                        timeout = deadline - loop.time()
+                        if timeout <= 0:
+                            break
+                        record = await asyncio.wait_for(self.queue.get(), timeout)
+                    else:
+                        record = self.queue.get_nowait()
+                except asyncio.TimeoutError:
+                    break
+                if record is None:
+                    closing = True
+                    break
+                batch.append(record)
+            if batch:
+                await self._flush(batch)
+
+    async def _flush(self, batch: list[dict[str, Any]]) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.sink.write(batch)
+            except Exception as e:
+                log(
+                    "WARNING",
+                    f"Export to {type(self.sink).__name__} failed "
+                    f"(attempt {attempt + 1}): {escape_tag(repr(e))}",
+                )
+                if attempt < self.max_retries:
+                    await asyncio.sleep(min(2**attempt, 30))
+            else:
+                self.exported += len(batch)
+                return
+        self.dropped += len(batch)
+        log("ERROR", f"Export dropped {len(batch)} records after retries.")
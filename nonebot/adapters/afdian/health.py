@@ -0,0 +1,136 @@
+import asyncio
+import random
+from typing import TYPE_CHECKING
+
+from nonebot.utils import escape_tag
+
+from .exception import CircuitBreakerOpen
+from .utils import log
+
+if TYPE_CHECKING:
+    from .adapter import Adapter
+    from .bot import TokenBot
+
+
+class HealthMonitor:
+    """TokenBot 健康检查
+
+    健康时以 interval 为间隔 ping，失败后以 retry_interval 起逐次翻倍的间隔重试；
+    连续失败 disconnect_after 次后视为不可用并断开 Bot，此后定时尝试重新连接。
+    未连接的 Bot 以 retry_interval 为间隔重连；已连接 Bot 的首次检查随机错开，
+    间隔带有抖动，避免同时 ping。
+    """
+
+    def __init__(
+        self,
+        adapter: "Adapter",
+        interval: float = 600.0,
+        retry_interval: float = 30.0,
+        disconnect_after: int = 3,
+        jitter: float = 0.1,
+    ):
+        """
+        :param adapter: 适配器
+        :param interval: 健康时的检查间隔（秒）
+        :param retry_interval: 失败后的首次重试间隔（秒）
+        :param disconnect_after: 连续失败多少次后断开 Bot
+        :param jitter: 间隔的随机抖动比例
+        """
+        self.adapter = adapter
+        self.interval = interval
+        self.retry_interval = retry_interval
+        self.disconnect_after = disconnect_after
+        self.jitter = jitter
+
+        self.failures: dict[str, int] = {}
+        """每个 Bot 的连续失败次数"""
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def is_degraded(self, user_id: str) -> bool:
+        """Bot 是否已连续失败 disconnect_after 次，偶发的单次失败不算"""
+        return self.failures.get(user_id, 0) >= self.disconnect_after
+
+    def watch(self, user_id: str) -> None:
+        """开始检查 Bot，已在检查的不会重复开始"""
+        if user_id not in self._tasks:
+            self._tasks[user_id] = asyncio.create_task(self._run(user_id))
+
+    def unwatch(self, user_id: str) -> None:
+        """停止检查 Bot"""
+        if task := self._tasks.pop(user_id, None):
+            task.cancel()
+        self.failures.pop(user_id, None)
+
+    async def close(self) -> None:
+        """停止所有检查"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self.failures.clear()
+
+    def next_interval(self, user_id: str) -> float:
+        """下一次检查前等待的秒数"""
+        failures = self.failures.get(user_id, 0)
+        if failures:
+            interval = min(self.retry_interval * 2 ** (failures - 1), self.interval)
+        elif user_id not in self.adapter.bots:
+            # 首次连接失败的 Bot 尽快重连
+            interval = self.retry_interval
+        else:
+            interval = self.interval
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def _run(self, user_id: str) -> None:
+        if user_id in self.adapter.bots:
+            # 首次检查在一个间隔内随机错开
+            await asyncio.sleep(random.uniform(0, self.interval))
+        else:
+            # 连接中或连接失败的 Bot，等待首次连接完成后再检查
+            await asyncio.sleep(self.next_interval(user_id))
+        while True:
+            await self.check(user_id)
+            await asyncio.sleep(self.next_interval(user_id))
+
+    async def check(self, user_id: str) -> bool | None:
+        """
+        检查一次 Bot，未连接的 Bot 会尝试重新连接
+
+        :return: 是否健康，上游熔断等无法判断时返回 None
+        """
+        bot_info = self.adapter.bot_infos.get(user_id)
+        if bot_info is None or not bot_info.token:
+            return None
+        bot: TokenBot | None = self.adapter.bots.get(user_id)  # type: ignore
+        try:
+            if bot is None:
+                ok = await self.adapter._connect_bot(bot_info) is not None
+            else:
+                ok = (await bot.send_ping()).ec == 200
+        except CircuitBreakerOpen:
+            return None
+        except Exception as e:
+            log(
+                "WARNING",
+                f"<y>Bot {escape_tag(user_id)}</y> health check failed: "
+                f"{escape_tag(repr(e))}",
+            )
+            ok = False
+
+        if ok:
+            # 此前失败过，或首次连接失败后由健康检查连接成功
+            if self.failures.pop(user_id, 0) or bot is None:
+                log("INFO", f"<y>Bot {escape_tag(user_id)}</y> <g>recovered</g>")
+                self.adapter._on_bot_recovered(user_id)
+            return True
+
+        failures = self.failures[user_id] = self.failures.get(user_id, 0) + 1
+        log(
+            "WARNING",
+            f"<y>Bot {escape_tag(user_id)}</y> <r>degraded</r>, failures={failures}",
+        )
+        if bot is not None and failures >= self.disconnect_after:
+            self.adapter.bot_disconnect(bot)
+            log("WARNING", f"<y>Bot {escape_tag(user_id)}</y> disconnected")
+        return False
@@ -0,0 +1,126 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+import json
+from typing import Any, cast
+
+from nonebot.compat import model_dump
+from nonebot.utils import escape_tag
+
+from .event import OrderNotifyEvent
+from .exception import NetworkError
+from .utils import log
+
+
+class IngestServer:
+    """事件接收端，运行在持有 Bot 的主进程中
+
+    通过 Unix Socket 接收 ingest 进程验证过的事件，每行一个 JSON 帧，
+    交给 handler 处理后回复一行 ack。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        handler: Callable[[str, dict[str, Any], bool], Awaitable[None]],
+    ):
+        """
+        :param path: Unix Socket 路径
+        :param handler: 事件处理函数，参数为 Bot 用户 ID、事件数据与是否已通过 API 验证
+        """
+        self.path = path
+        self.handler = handler
+        self._server: asyncio.AbstractServer | None = None
+        self._clients: set[asyncio.StreamWriter] = set()
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_unix_server(self._handle_client, self.path)
+        log("INFO", f"Ingest server listening on <y>{escape_tag(self.path)}</y>")
+
+    async def close(self) -> None:
+        if self._server:
+            self._server.close()
+            # Python 3.12 起 wait_closed 会等待已建立的连接结束，需主动关闭 ingest 进程的长连接
+            for writer in self._clients:
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._clients.add(writer)
+        try:
+            while line := await reader.readline():
+                try:
+                    frame = json.loads(line)
+                    await self.handler(
+                        frame["user_id"], frame["event"], frame.get("verified", False)
+                    )
+                except Exception as e:
+                    log("ERROR", f"Ingest frame handle failed: {escape_tag(repr(e))}")
+                    writer.write(b"0\n")
+                else:
+                    writer.write(b"1\n")
+                await writer.drain()
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+
+class IngestClient:
+    """事件发送端，运行在 ingest 进程中，将验证过的事件转交主进程"""
+
+    def __init__(self, path: str):
+        """
+        :param path: 主进程 IngestServer 的 Unix Socket 路径
+        """
+        self.path = path
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._lock = asyncio.Lock()
+
+    async def send(self, user_id: str, event: OrderNotifyEvent) -> None:
+        """
+        发送事件并等待主进程确认
+
+        :raises NetworkError: 主进程不可达或拒绝了该事件
+        """
+        frame = json.dumps(
+            {"user_id": user_id, "event": model_dump(event), "verified": event.verified}
+        ).encode()
+        async with self._lock:
+            # 连接可能已被主进程关闭，失败时重连一次
+            for attempt in range(2):
+                try:
+                    if self._reader is None or self._writer is None:
+                        await self._connect()
+                    reader, writer = cast(
+                        tuple[asyncio.StreamReader, asyncio.StreamWriter],
+                        (self._reader, self._writer),
+                    )
+                    writer.write(frame + b"\n")
+                    await writer.drain()
+                    ack = await reader.readline()
+                except OSError as e:
+                    await self.close()
+                    if attempt:
+                        raise NetworkError(f"Ingest host unreachable: {e!r}") from e
+                    continue
+                if not ack:
+                    await self.close()
+                    if attempt:
+                        raise NetworkError("Ingest host closed connection")
+                    continue
+                if ack != b"1\n":
+                    raise NetworkError("Ingest host rejected event")
+                return
+
+    async def _connect(self) -> None:
+        await self.close()
+        self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+
+    async def close(self) -> None:
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+            self._reader = None
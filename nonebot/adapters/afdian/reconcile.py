@@ -0,0 +1,134 @@
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+import time
+from typing import TYPE_CHECKING
+
+from nonebot.utils import escape_tag
+
+from .event import OrderNotifyEvent
+from .payload import Order, WebhookData
+from .utils import log
+
+if TYPE_CHECKING:
+    from .bot import TokenBot
+
+
+class Reconciler:
+    """订单对账
+
+    定时查询最新的订单页，与已通过 Webhook 送达的订单比对，
+    为漏推的订单补发 OrderNotifyEvent。
+    有新订单时（无论是否已通过 Webhook 送达）以最小间隔轮询，空闲时间隔逐步翻倍直到最大间隔。
+    """
+
+    def __init__(
+        self,
+        bot: "TokenBot",
+        dispatch: Callable[[str, OrderNotifyEvent], Awaitable[None]],
+        min_interval: float = 60.0,
+        max_interval: float = 1800.0,
+        max_pages: int = 3,
+        lookback: float = 0.0,
+        seen_size: int = 1000,
+        started_at: float | None = None,
+    ):
+        """
+        :param bot: 对账的 TokenBot
+        :param dispatch: 补发事件的分发函数，负责记录已送达
+        :param min_interval: 最小轮询间隔（秒）
+        :param max_interval: 最大轮询间隔（秒）
+        :param max_pages: 每次最多查询的页数
+        :param lookback: 首次对账时，创建时间在启动前多少秒内的订单也视为漏推
+        :param seen_size: 记录已送达订单号的数量上限
+        :param started_at: 启动时间，默认为当前时间；首次对账时之后创建的订单视为漏推
+        """
+        self.bot = bot
+        self.dispatch = dispatch
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_pages = max_pages
+        self.lookback = lookback
+        self.seen_size = seen_size
+
+        self.interval: float = min_interval
+        self.seen: OrderedDict[str, None] = OrderedDict()
+        self.found_new: bool = False
+        """最近一次对账是否发现了比上一次更新的订单"""
+        self._newest: int = 0
+        self._started_at = time.time() if started_at is None else started_at
+        self._primed = False
+
+    def mark_delivered(self, out_trade_no: str) -> None:
+        """记录已送达的订单号"""
+        self.seen[out_trade_no] = None
+        self.seen.move_to_end(out_trade_no)
+        while len(self.seen) > self.seen_size:
+            self.seen.popitem(last=False)
+
+    async def reconcile(self) -> list[Order]:
+        """
+        查询最新订单页并找出漏推的订单，按创建时间从早到晚返回
+
+        首次对账只建立基线，不返回启动前（lookback 之外）的历史订单；
+        返回的订单在分发时才记为已送达
+        """
+        missed: list[Order] = []
+        newest = self._newest
+        for page in range(1, self.max_pages + 1):
+            response = await self.bot.query_order_by_page(page, export=False)
+            orders = response.data.list
+            newest = max(
+                newest, max((order.create_time or 0 for order in orders), default=0)
+            )
+            unseen = [order for order in orders if order.out_trade_no not in self.seen]
+            for order in unseen:
+                if self._primed or (
+                    order.create_time is not None
+                    and order.create_time >= self._started_at - self.lookback
+                ):
+                    missed.append(order)
+                else:
+                    self.mark_delivered(order.out_trade_no)
+            # 整页都已送达，更早的订单无需再查
+            if not unseen or page >= (response.data.total_page or 0):
+                break
+        self.found_new = bool(missed) or (self._primed and newest > self._newest)
+        self._newest = newest
+        self._primed = True
+        missed.reverse()
+        return missed
+
+    def _update_interval(self, found_new: bool) -> None:
+        if found_new:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+
+    async def run(self) -> None:
+        """对账循环"""
+        while True:
+            try:
+                missed = await self.reconcile()
+            except Exception as e:
+                log(
+                    "WARNING",
+                    f"<y>Bot {escape_tag(self.bot.self_id)}</y> reconcile failed: "
+                    f"{escape_tag(repr(e))}",
+                )
+                missed = []
+                self.found_new = False
+            for order in missed:
+                log(
+                    "INFO",
+                    f"<y>Bot {escape_tag(self.bot.self_id)}</y> reconciled missed order "
+                    f"{escape_tag(order.out_trade_no)}",
+                )
+                event = OrderNotifyEvent(
+                    ec=200, em="ok", data=WebhookData(type="order", order=order)
+                )
+                # 订单来自 API 查询，视为已验证
+                event._verified = True
+                await self.dispatch(self.bot.self_id, event)
+            self._update_interval(self.found_new)
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,171 @@
+import asyncio
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+import time
+from typing import TYPE_CHECKING, NamedTuple
+
+from nonebot.drivers import URL, Request
+
+if TYPE_CHECKING:
+    from .adapter import Adapter
+
+
+class WebhookRecord(NamedTuple):
+    ts: float
+    """收到 Webhook 的时间戳"""
+    user_id: str
+    body: str
+    """原始请求体"""
+
+
+class WebhookRecorder:
+    """Webhook 流量记录
+
+    每行一条 JSON 数组 [时间戳, user_id, 原始请求体]，缓冲后定时批量写入文件。
+    """
+
+    def __init__(self, path: str | Path, flush_interval: float = 1.0):
+        """
+        :param path: 记录文件路径，追加写入
+        :param flush_interval: 缓冲写入间隔（秒）
+        """
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self._buffer: list[str] = []
+        self._flush_task: asyncio.Task | None = None
+
+    def record(self, user_id: str, body: bytes | str | None) -> None:
+        """记录一次 Webhook 请求"""
+        if isinstance(body, bytes):
+            body = body.decode("utf-8", "replace")
+        self._buffer.append(
+            json.dumps([round(time.time(), 3), user_id, body or ""], ensure_ascii=False)
+        )
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """将缓冲的记录写入文件"""
+        lines, self._buffer = self._buffer, []
+        if lines:
+            await asyncio.to_thread(self._write, lines)
+
+    def _write(self, lines: list[str]) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+def load_records(path: str | Path) -> list[WebhookRecord]:
+    """读取 WebhookRecorder 写入的记录"""
+    with Path(path).open(encoding="utf-8") as f:
+        return [WebhookRecord(*json.loads(line)) for line in f if line.strip()]
+
+
+@dataclass
+class ReplayReport:
+    """回放结果"""
+
+    duration: float = 0.0
+    """总耗时（秒）"""
+    statuses: dict[int, int] = field(default_factory=dict)
+    """各响应状态码的数量"""
+    latencies: list[float] = field(default_factory=list)
+    """每个请求的处理耗时（秒）"""
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def throughput(self) -> float:
+        """每秒处理的请求数"""
+        return self.count / self.duration if self.duration else 0.0
+
+    def percentile(self, p: float) -> float:
+        """处理耗时的百分位数（秒），p 取 0-100"""
+        if not self.latencies:
+            return 0.0
+        latencies = sorted(self.latencies)
+        return latencies[min(int(len(latencies) * p / 100), len(latencies) - 1)]
+
+    def __str__(self) -> str:
+        return (
+            f"requests={self.count} duration={self.duration:.3f}s "
+            f"throughput={self.throughput:.1f}/s "
+            f"p50={self.percentile(50) * 1000:.2f}ms "
+            f"p95={self.percentile(95) * 1000:.2f}ms "
+            f"p99={self.percentile(99) * 1000:.2f}ms "
+            f"max={max(self.latencies, default=0) * 1000:.2f}ms "
+            f"statuses={self.statuses}"
+        )
+
+
+async def replay(
+    adapter: "Adapter",
+    records: list[WebhookRecord],
+    speed: float | None = 1.0,
+    api_base: str | None = None,
+    concurrency: int = 100,
+) -> ReplayReport:
+    """
+    将记录的 Webhook 流量回放给适配器
+
+    :param adapter: 适配器
+    :param records: 记录，见 load_records
+    :param speed: 回放倍速，1 为原速，None 为不等待、尽快回放
+    :param api_base: 回放期间使用的爱发电 API 地址，通常为本地桩服务，指定时回放期间不使用缓存
+    :param concurrency: 同时处理的最大请求数
+    :return: 回放结果
+    """
+    report = ReplayReport()
+    if not records:
+        return report
+
+    config = adapter.afdian_config
+    original_api_base = config.afdian_api_base
+    recorder, adapter.recorder = adapter.recorder, None
+    cache = adapter.cache
+    if api_base is not None:
+        config.afdian_api_base = api_base
+        adapter.cache = None
+
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+
+    async def _send(record: WebhookRecord) -> None:
+        async with semaphore:
+            request = Request(
+                "POST",
+                URL(adapter.webhook_url + record.user_id),
+                headers={"Content-Type": "application/json"},
+                content=record.body.encode(),
+            )
+            start = loop.time()
+            response = await adapter._handle_webhook(request, record.user_id)
+            report.latencies.append(loop.time() - start)
+            report.statuses[response.status_code] = (
+                report.statuses.get(response.status_code, 0) + 1
+            )
+
+    try:
+        tasks: list[asyncio.Task] = []
+        first_ts = records[0].ts
+        start = loop.time()
+        for record in records:
+            if speed:
+                delay = start + (record.ts - first_ts) / speed - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(_send(record)))
+        await asyncio.gather(*tasks)
+        report.duration = loop.time() - start
+    finally:
+        config.afdian_api_base = original_api_base
+        adapter.recorder = recorder
+        adapter.cache = cache
+    return report
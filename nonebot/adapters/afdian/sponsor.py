@@ -0,0 +1,114 @@
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from .payload import BaseAfdianResponse, ResponseData
+
+
+class SponsorPlan(BaseModel):
+    """赞助方案"""
+
+    plan_id: str
+    rank: int
+    user_id: str
+    status: int
+    name: str
+    pic: str
+    desc: str
+    price: str
+    update_time: int
+    pay_month: int
+    show_price: str
+    independent: int
+    permanent: int
+    can_buy_hide: int
+    need_address: int
+    product_type: int
+    sale_limit_count: int
+    need_invite_code: bool
+    expire_time: int
+    sku_processed: list
+    rankType: int
+
+
+class Timing(BaseModel):
+    timing_on: int
+    timing_off: int
+
+
+class CurrentPlan(BaseModel):
+    """赞助方案"""
+
+    can_ali_agreement: int | None = None
+    plan_id: str | None = None
+    rank: int | None = None
+    user_id: str | None = None
+    status: int | None = None
+    name: str
+    pic: str | None = None
+    desc: str | None = None
+    price: str | None = None
+    update_time: int | None = None
+    timing: Timing | None = None
+    pay_month: int | None = None
+    show_price: str | None = None
+    show_price_after_adjust: str | None = None
+    has_coupon: int | None = None
+    coupon: list | None = None
+    favorable_price: int | None = None
+    independent: int | None = None
+    permanent: int | None = None
+    can_buy_hide: int | None = None
+    need_address: int | None = None
+    product_type: int | None = None
+    sale_limit_count: int | None = None
+    need_invite_code: bool | None = None
+    bundle_stock: int | None = None
+    bundle_sku_select_count: int | None = None
+    config: dict[str, Any] | None = None
+    has_plan_config: int | None = None
+    shipping_fee_info: list | None = None
+    expire_time: int | None = None
+    sku_processed: list | None = None
+    rank_type: int | None = Field(None, alias="rankType")
+
+
+class User(BaseModel):
+    """用户属性"""
+
+    user_id: str
+    """用户唯一ID"""
+    name: str
+    """昵称，非唯一，可重复"""
+    avatar: str
+    """头像"""
+
+
+class SponsorList(BaseModel):
+    """赞助者列表"""
+
+    sponsor_plans: list[SponsorPlan]
+    """赞助方案"""
+    current_plan: CurrentPlan
+    """当前赞助方案，如果节点仅有 name: ""，不包含其它内容时，表示无方案"""
+    all_sum_amount: str
+    """累计赞助金额，此处为折扣前金额。如有兑换码，则此处为虚拟金额，回比实际提现的多"""
+    create_time: int | None = None
+    """int 秒级时间戳，表示成为赞助者的时间，即首次赞助时间"""
+    first_pay_time: int | None = None
+    last_pay_time: int
+    """int 秒级时间戳，最近一次赞助时间"""
+    user: User
+    """用户属性"""
+
+
+class SponsorResponseData(ResponseData):
+    """赞助者响应数据"""
+
+    list: list[SponsorList]
+
+
+class SponsorResponse(BaseAfdianResponse):
+    """赞助者 Response"""
+
+    data: SponsorResponseData
@@ -16,19 +16,75 @@ log = logger_wrapper("Afdian")
 T = TypeVar("T", bound=BaseAfdianResponse)
 
 
+def _is_plain(value: str) -> bool:
+    """字符串在 json.dumps 中是否原样输出（可打印 ASCII，且不含引号与反斜杠）"""
+    return (
+        value.isascii()
+        and value.isprintable()
+        and '"' not in value
+        and "\\" not in value
+    )
+
+
+def dumps_params(params: dict[str, Any]) -> str:
+    """
+    序列化请求参数，结果与 json.dumps(params) 完全一致
+
+    键为字符串、值为普通字符串或整数的常见参数直接拼接，其余情况交给 json.dumps
+    """
+    parts: list[str] = []
+    for key, value in params.items():
+        if not (isinstance(key, str) and _is_plain(key)):
+            return json.dumps(params)
+        if isinstance(value, str) and _is_plain(value):
+            parts.append(f'"{key}": "{value}"')
+        elif type(value) is int:
+            parts.append(f'"{key}": {value}')
+        else:
+            return json.dumps(params)
+    return "{" + ", ".join(parts) + "}"
+
+
+class Signer:
+    """请求签名上下文
+
+    Token 与 user_id 不变，预先计算 md5(token + "params") 的中间状态，
+    每次签名只需复制该状态并追加参数部分。
+    """
+
+    def __init__(self, user_id: str, token: str):
+        self.user_id = user_id
+        self.token = token
+        self._prefix = hashlib.md5(f"{token}params".encode())
+        self._suffix = f"user_id{user_id}".encode()
+
+    def sign(self, param_json_data: str, ts: int) -> str:
+        """计算签名，等价于 md5(f"{token}params{params}ts{ts}user_id{user_id}")"""
+        md5 = self._prefix.copy()
+        md5.update(param_json_data.encode())
+        md5.update(b"ts%d" % ts)
+        md5.update(self._suffix)
+        return md5.hexdigest()
+
+    def construct_request(self, url: str, params: dict[str, Any]) -> Request:
+        ts = int(time.time())
+        param_json_data = dumps_params(params)
+        return Request(
+            "POST",
+            url=url,
+            params={
+                "user_id": self.user_id,
+                "params": param_json_data,
+                "ts": ts,
+                "sign": self.sign(param_json_data, ts),
+            },
+        )
+
+
 def construct_request(
     url: str, user_id: str, token: str, params: dict[str, Any]
 ) -> Request:
-    ts = int(time.time())
-    param_json_data = json.dumps(params)
-    sign_str = f"{token}params{param_json_data}ts{ts}user_id{user_id}"
-    sign = hashlib.md5(sign_str.encode("utf-8")).hexdigest()
-    request = Request(
-        "POST",
-        url=url,
-        params={"user_id": user_id, "params": param_json_data, "ts": ts, "sign": sign},
-    )
-    return request
+    return Signer(user_id, token).construct_request(url, params)
 
 
 def parse_response(response: Response, response_model: type[T]) -> T:
@@ -22,6 +22,7 @@ def pytest_configure(config: pytest.Config) -> None:
                 "token": "",
             },
         ],
+        "afdian_health_interval": 600,
     }
 
 
@@ -0,0 +1,50 @@
+from nonebot.adapters.afdian.analytics import (  # type: ignore
+    MONTH_SECONDS,
+    OrderTable,
+    parse_cents,
+)
+from nonebot.adapters.afdian.payload import Order  # type: ignore
+
+
+def make_order(user_id: str, plan_id: str, amount: str, create_time: int) -> Order:
+    return Order(
+        out_trade_no=f"{user_id}-{create_time}",
+        user_id=user_id,
+        plan_id=plan_id,
+        month=1,
+        total_amount=amount,
+        show_amount=amount,
+        status=2,
+        product_type=0,
+        create_time=create_time,
+    )
+
+
+def test_parse_cents():
+    assert parse_cents("5.00") == 500
+    assert parse_cents("0.5") == 50
+    assert parse_cents("12") == 1200
+    assert parse_cents("-1.25") == -125
+    assert parse_cents("") == 0
+
+
+def test_order_table():
+    # 2024-01-01 00:00:00 UTC+8
+    jan = 1704038400
+    table = OrderTable.from_orders(
+        [
+            make_order("a", "p1", "5.00", jan),
+            make_order("b", "p1", "5.00", jan + 86400),
+            make_order("a", "p2", "10.50", jan + MONTH_SECONDS + 86400),
+        ]
+    )
+
+    assert len(table) == 3
+    assert table.total_revenue() == 2050
+    assert table.revenue_by_plan() == {"p1": 1000, "p2": 1050}
+    assert table.revenue_by_user() == {"a": 1550, "b": 500}
+    assert table.revenue_by_month() == {"2024-01": 1000, "2024-02": 1050}
+    assert table.active_count(jan + 3600) == 1
+    assert table.active_count(jan + 2 * 86400) == 2
+    # b 的赞助在第二个月到期，a 续费
+    assert table.churn(jan + 2 * 86400, jan + MONTH_SECONDS + 2 * 86400) == 0.5
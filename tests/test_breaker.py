@@ -0,0 +1,346 @@
+import asyncio
+from collections.abc import Iterator
+import json
+from pathlib import Path
+from typing import Any
+
+from nonebug import App
+import pytest
+
+from nonebot import get_adapter
+from nonebot.adapters.afdian import Adapter, TokenBot  # type: ignore
+from nonebot.adapters.afdian.breaker import (  # type: ignore
+    BreakerState,
+    CircuitBreaker,
+)
+from nonebot.adapters.afdian.config import BotInfo  # type: ignore
+from nonebot.adapters.afdian.event import OrderNotifyEvent  # type: ignore
+from nonebot.adapters.afdian.exception import NetworkError  # type: ignore
+from nonebot.compat import type_validate_json
+from nonebot.drivers import URL, Request, Response
+
+REQUEST = {"user_id": "breaker", "params": "", "ts": 0, "sign": ""}
+
+
+def webhook_body(out_trade_no: str) -> bytes:
+    with (Path(__file__).parent / "events.json").open("r") as f:
+        data = json.load(f)
+    data["data"]["order"]["out_trade_no"] = out_trade_no
+    return json.dumps(data).encode()
+
+
+def webhook_request(out_trade_no: str) -> Request:
+    return Request(
+        "POST",
+        URL("/afdian/webhooks/breaker"),
+        headers={"Content-Type": "application/json"},
+        content=webhook_body(out_trade_no),
+    )
+
+
+def order_response(*out_trade_nos: str) -> Response:
+    orders = [
+        json.loads(webhook_body(out_trade_no))["data"]["order"]
+        for out_trade_no in out_trade_nos
+    ]
+    data = {"total_count": len(orders), "total_page": 1, "request": REQUEST}
+    return Response(
+        200,
+        content=json.dumps(
+            {"ec": 200, "em": "ok", "data": {**data, "list": orders}}
+        ).encode(),
+    )
+
+
+def ping_response() -> Response:
+    return Response(
+        200,
+        content=json.dumps(
+            {"ec": 200, "em": "ok", "data": {"uid": "breaker", "request": REQUEST}}
+        ).encode(),
+    )
+
+
+class Upstream:
+    """按顺序返回预设响应的上游，预设用完后请求失败"""
+
+    def __init__(self):
+        self.responses: list[Response] = []
+        self.requests: list[Request] = []
+
+    async def __call__(self, request: Request) -> Response:
+        self.requests.append(request)
+        if not self.responses:
+            raise NetworkError("upstream down")
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def breaker_adapter(app: App) -> Iterator[tuple[Adapter, Upstream, list[Any]]]:
+    adapter = get_adapter(Adapter)
+    config = adapter.afdian_config
+    original = (
+        adapter.breaker,
+        config.afdian_breaker_policy,
+        config.afdian_quarantine_size,
+    )
+    adapter.breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=3600)
+    upstream = Upstream()
+    adapter.request = upstream  # type: ignore
+    adapter.bot_infos["breaker"] = BotInfo(user_id="breaker", token="token")
+    bot = TokenBot(adapter, "breaker", "token")
+    handled: list[OrderNotifyEvent] = []
+
+    async def handle_event(event: OrderNotifyEvent) -> None:
+        handled.append(event)
+
+    bot.handle_event = handle_event  # type: ignore
+    adapter.bot_connect(bot)
+    try:
+        yield adapter, upstream, handled
+    finally:
+        if adapter._probe_task:
+            adapter._probe_task.cancel()
+        if bot := adapter.bots.get("breaker"):
+            adapter.bot_disconnect(bot)  # type: ignore
+        adapter.bot_infos.pop("breaker", None)
+        adapter._signers.pop("breaker", None)
+        adapter.quarantine.clear()
+        adapter.quarantine_dropped = 0
+        del adapter.request
+        (
+            adapter.breaker,
+            config.afdian_breaker_policy,
+            config.afdian_quarantine_size,
+        ) = original
+
+
+def test_breaker_open_and_probe():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0)
+
+    breaker.record(0.1, ok=False)
+    assert breaker.state is BreakerState.CLOSED
+    breaker.record(0.1, ok=False)
+    assert breaker.state is BreakerState.OPEN
+    assert not breaker.allow()
+
+    # 半开时只放行一个探测请求
+    breaker.half_open()
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record(0.1, ok=False)
+    assert breaker.state is BreakerState.OPEN
+
+    breaker.half_open()
+    assert breaker.allow()
+    breaker.record(0.1, ok=True)
+    assert breaker.state is BreakerState.CLOSED
+    assert breaker.allow()
+
+    metrics = breaker.metrics()
+    assert metrics["open_count"] == 2
+    assert metrics["total_rejected"] == 2
+
+
+def test_breaker_release_probe():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+    breaker.record(0.1, ok=False)
+    breaker.half_open()
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.release_probe()
+    assert breaker.state is BreakerState.HALF_OPEN
+    assert breaker.allow()
+
+
+def test_breaker_latency_threshold():
+    breaker = CircuitBreaker(failure_threshold=1, latency_threshold=1.0)
+
+    breaker.record(0.5, ok=True)
+    assert breaker.state is BreakerState.CLOSED
+    breaker.record(2.0, ok=True)
+    assert breaker.state is BreakerState.OPEN
+    assert breaker.metrics()["total_slow"] == 1
+
+
+@pytest.mark.asyncio
+async def test_quarantine_full(breaker_adapter: tuple[Adapter, Upstream, list]):
+    adapter, _, handled = breaker_adapter
+    adapter.afdian_config.afdian_breaker_policy = "quarantine"
+    adapter.afdian_config.afdian_quarantine_size = 1
+    adapter._record_upstream(0.1, ok=False)
+
+    response = await adapter._handle_webhook(webhook_request("1"), "breaker")
+    assert response.status_code == 200
+    # 队列已满时不能返回成功，否则爱发电不会重试
+    response = await adapter._handle_webhook(webhook_request("2"), "breaker")
+    assert response.status_code == 503
+    assert [event.data.order.out_trade_no for _, event in adapter.quarantine] == ["1"]
+    assert handled == []
+
+
+@pytest.mark.asyncio
+async def test_drain_quarantine_failures(
+    breaker_adapter: tuple[Adapter, Upstream, list],
+):
+    adapter, upstream, handled = breaker_adapter
+    for out_trade_no in ("1", "2"):
+        event = type_validate_json(OrderNotifyEvent, webhook_body(out_trade_no))
+        adapter.quarantine.append(("breaker", event))
+    # 订单 1 不存在，丢弃并计数；订单 2 验证请求失败，保留等待重试
+    upstream.responses = [order_response(), Response(400, content=b"")]
+
+    await adapter._drain_quarantine()
+    await asyncio.sleep(0)
+    assert adapter.quarantine_dropped == 1
+    assert [event.data.order.out_trade_no for _, event in adapter.quarantine] == ["2"]
+    assert handled == []
+
+
+@pytest.mark.asyncio
+async def test_breaker_policy_reject(breaker_adapter: tuple[Adapter, Upstream, list]):
+    adapter, upstream, handled = breaker_adapter
+    adapter._record_upstream(0.1, ok=False)
+
+    response = await adapter._handle_webhook(webhook_request("1"), "breaker")
+    assert response.status_code == 503
+    # 熔断期间不发出验证请求
+    assert upstream.requests == []
+    assert handled == []
+
+
+@pytest.mark.asyncio
+async def test_breaker_policy_dispatch(
+    breaker_adapter: tuple[Adapter, Upstream, list],
+):
+    adapter, upstream, handled = breaker_adapter
+    adapter.afdian_config.afdian_breaker_policy = "dispatch"
+    adapter._record_upstream(0.1, ok=False)
+
+    response = await adapter._handle_webhook(webhook_request("1"), "breaker")
+    assert response.status_code == 200
+    await asyncio.sleep(0)
+    assert upstream.requests == []
+    assert [event.data.order.out_trade_no for event in handled] == ["1"]
+    assert handled[0].verified is False
+
+
+@pytest.mark.asyncio
+async def test_verify_uses_bot_signer(breaker_adapter: tuple[Adapter, Upstream, list]):
+    adapter, upstream, _ = breaker_adapter
+    upstream.responses = [order_response("1")]
+
+    # 已连接的 TokenBot 直接使用自身的签名器，不另外缓存
+    response = await adapter._handle_webhook(webhook_request("1"), "breaker")
+    assert response.status_code == 200
+    assert [request.url.path for request in upstream.requests] == [
+        "/api/open/query-order"
+    ]
+    assert "breaker" not in adapter._signers
+
+
+@pytest.mark.asyncio
+async def test_breaker_trips_on_upstream_failures(
+    breaker_adapter: tuple[Adapter, Upstream, list],
+):
+    adapter, upstream, _ = breaker_adapter
+    upstream.responses = [Response(502, content=b"")]
+
+    response = await adapter._handle_webhook(webhook_request("1"), "breaker")
+    assert response.status_code == 400
+    assert adapter.breaker.state is BreakerState.OPEN
+    response = await adapter._handle_webhook(webhook_request("1"), "breaker")
+    assert response.status_code == 503
+    assert len(upstream.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_breaker_probe_drains_quarantine(
+    breaker_adapter: tuple[Adapter, Upstream, list],
+):
+    adapter, upstream, handled = breaker_adapter
+    adapter.afdian_config.afdian_breaker_policy = "quarantine"
+    adapter.breaker.recovery_timeout = 0.01
+    # 探测先失败一次，再成功，恢复后重新验证隔离的订单
+    upstream.responses = [Response(500, content=b"")]
+    adapter._record_upstream(0.1, ok=False)
+
+    response = await adapter._handle_webhook(webhook_request("1"), "breaker")
+    assert response.status_code == 200
+    assert len(adapter.quarantine) == 1
+    assert handled == []
+
+    await asyncio.sleep(0.05)
+    assert adapter.breaker.state is BreakerState.OPEN
+    upstream.responses = [ping_response(), order_response("1")]
+    for _ in range(100):
+        if handled:
+            break
+        await asyncio.sleep(0.01)
+
+    assert adapter.breaker.state is BreakerState.CLOSED
+    assert not adapter.quarantine
+    assert [event.data.order.out_trade_no for event in handled] == ["1"]
+    assert handled[0].verified is True
+    assert [request.url.path for request in upstream.requests][-2:] == [
+        "/api/open/ping",
+        "/api/open/query-order",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_disconnected_bot_uses_policy(
+    breaker_adapter: tuple[Adapter, Upstream, list],
+):
+    adapter, upstream, _ = breaker_adapter
+    assert adapter.health is not None
+    adapter.bot_disconnect(adapter.bots["breaker"])  # type: ignore
+
+    # 已配置 Token 但未连接的 Bot 不返回 404，而是按熔断策略处理
+    response = await adapter._handle_webhook(webhook_request("1"), "breaker")
+    assert response.status_code == 503
+    adapter.afdian_config.afdian_breaker_policy = "dispatch"
+    response = await adapter._handle_webhook(webhook_request("1"), "breaker")
+    assert response.status_code == 503
+    adapter.afdian_config.afdian_breaker_policy = "quarantine"
+    response = await adapter._handle_webhook(webhook_request("1"), "breaker")
+    assert response.status_code == 200
+    assert len(adapter.quarantine) == 1
+    assert upstream.requests == []
+
+    # 健康检查重新连接后重新验证隔离的订单
+    upstream.responses = [ping_response(), order_response("1")]
+    assert await adapter.health.check("breaker") is True
+    for _ in range(100):
+        if not adapter.quarantine:
+            break
+        await asyncio.sleep(0.01)
+    assert "breaker" in adapter.bots
+    assert not adapter.quarantine
+    assert adapter.quarantine_dropped == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_releases_half_open(
+    breaker_adapter: tuple[Adapter, Upstream, list],
+):
+    adapter, _, _ = breaker_adapter
+    adapter._record_upstream(0.1, ok=False)
+    adapter.breaker.half_open()
+
+    async def hang(request: Request) -> Response:
+        await asyncio.Event().wait()
+        raise AssertionError
+
+    adapter.request = hang  # type: ignore
+    probe = asyncio.create_task(adapter.upstream_request(webhook_request("1")))
+    await asyncio.sleep(0)
+    assert not adapter.breaker.allow()
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    # 探测请求被取消后，下一个请求可以重新探测
+    assert adapter.breaker.state is BreakerState.HALF_OPEN
+    assert adapter.breaker.allow()
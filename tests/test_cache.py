@@ -0,0 +1,124 @@
+import json
+from pathlib import Path
+
+from nonebug import App
+import pytest
+
+from nonebot import get_adapter
+from nonebot.adapters.afdian import Adapter, TokenBot  # type: ignore
+from nonebot.adapters.afdian.cache import SQLiteCache  # type: ignore
+from nonebot.drivers import Request, Response
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_shared(tmp_path: Path):
+    path = tmp_path / "cache.db"
+    first, second = SQLiteCache(path), SQLiteCache(path)
+    try:
+        assert await first.get("key") is None
+        await first.set("key", b"value", 60)
+        # 同一文件的另一个连接（如另一个进程）可以读到
+        assert await second.get("key") == b"value"
+        await second.set("expired", b"value", 0)
+        assert await first.get("expired") is None
+    finally:
+        await first.close()
+        await second.close()
+
+
+@pytest.mark.asyncio
+async def test_query_order_cached(app: App, tmp_path: Path):
+    adapter = get_adapter(Adapter)
+    content = json.dumps(
+        {
+            "ec": 200,
+            "em": "ok",
+            "data": {
+                "total_count": 0,
+                "total_page": 1,
+                "request": {"user_id": "cached", "params": "", "ts": 0, "sign": ""},
+                "list": [],
+            },
+        }
+    ).encode()
+    requests: list[Request] = []
+
+    async def upstream_request(request: Request) -> Response:
+        requests.append(request)
+        return Response(200, content=content)
+
+    bot = TokenBot(adapter, "cached", "token")
+    adapter.upstream_request = upstream_request  # type: ignore
+    adapter.set_cache_backend(SQLiteCache(tmp_path / "cache.db"))
+    try:
+        first = await bot.query_order_by_page(1, export=False)
+        second = await bot.query_order_by_page(1, export=False)
+        assert first == second
+        assert len(requests) == 1
+        await bot.query_order_by_page(2, export=False)
+        assert len(requests) == 2
+    finally:
+        await adapter._close_cache()
+        adapter.set_cache_backend(None)
+        del adapter.upstream_request
+
+
+@pytest.mark.asyncio
+async def test_cached_orders_not_exported(app: App, tmp_path: Path):
+    adapter = get_adapter(Adapter)
+    content = json.dumps(
+        {
+            "ec": 200,
+            "em": "ok",
+            "data": {
+                "total_count": 0,
+                "total_page": 1,
+                "request": {"user_id": "cached", "params": "", "ts": 0, "sign": ""},
+                "list": [],
+            },
+        }
+    ).encode()
+    exported: list[str] = []
+
+    async def upstream_request(request: Request) -> Response:
+        return Response(200, content=content)
+
+    async def export_orders(bot_id: str, orders, source: str) -> None:
+        exported.append(bot_id)
+
+    bot = TokenBot(adapter, "cached", "token")
+    adapter.upstream_request = upstream_request  # type: ignore
+    adapter.export_orders = export_orders  # type: ignore
+    adapter.set_cache_backend(SQLiteCache(tmp_path / "cache.db"))
+    try:
+        # 只有实际请求到的结果写入导出管道，缓存命中不重复导出
+        await bot.query_order_by_out_trade_no("1")
+        await bot.query_order_by_out_trade_no("1")
+        assert exported == ["cached"]
+        await bot.query_order_by_page(1)
+        assert exported == ["cached", "cached"]
+    finally:
+        await adapter._close_cache()
+        adapter.set_cache_backend(None)
+        del adapter.upstream_request
+        del adapter.export_orders
+
+
+@pytest.mark.asyncio
+async def test_cache_keyed_by_api_base(app: App, tmp_path: Path):
+    adapter = get_adapter(Adapter)
+    config = adapter.afdian_config
+    original_api_base = config.afdian_api_base
+    adapter.set_cache_backend(SQLiteCache(tmp_path / "cache.db"))
+    try:
+        await adapter._cache_set("key", b"production", 60)
+        # 切换到桩服务后既读不到也不会覆盖正式上游的结果
+        config.afdian_api_base = "http://127.0.0.1:8000"
+        assert await adapter._cache_get("key") is None
+        await adapter._cache_set("key", b"stub", 60)
+        config.afdian_api_base = original_api_base
+        assert await adapter._cache_get("key") == b"production"
+    finally:
+        config.afdian_api_base = original_api_base
+        await adapter._close_cache()
+        adapter.set_cache_backend(None)
@@ -1,10 +1,16 @@
+from decimal import Decimal
 import json
 from pathlib import Path
 
 import pytest
 
-from nonebot.adapters.afdian.event import OrderNotifyEvent  # type: ignore
-from nonebot.compat import type_validate_python
+from nonebot.adapters.afdian.event import (  # type: ignore
+    OrderNotifyEvent,
+    ProductOrderEvent,
+    RedeemOrderEvent,
+    SponsorshipOrderEvent,
+)
+from nonebot.compat import model_dump, type_validate_python
 
 
 @pytest.mark.asyncio
@@ -14,3 +20,36 @@ async def test_event():
 
     parsed = type_validate_python(OrderNotifyEvent, test_event)
     assert isinstance(parsed, OrderNotifyEvent)
+    assert parsed.verified is False
+
+    # 验证状态由适配器设置，不能通过请求体伪造
+    parsed = type_validate_python(OrderNotifyEvent, {**test_event, "verified": True})
+    assert parsed.verified is False
+
+
+def test_event_specialize():
+    with (Path(__file__).parent / "events.json").open("r") as f:
+        test_event = json.load(f)
+
+    event = type_validate_python(OrderNotifyEvent, {**test_event, "extra_top": 1})
+    event._verified = True
+    parsed = event.specialize()
+    assert type(parsed) is SponsorshipOrderEvent
+    assert type(event) is OrderNotifyEvent
+    assert parsed.verified is True
+    # 额外字段不丢失
+    assert model_dump(parsed) == model_dump(event)
+    assert parsed.extra_top == 1  # type: ignore
+    assert parsed.amount == Decimal("5.00")
+    assert parsed.plan_id == "a45353328af911eb973052540025c377"
+    assert parsed.specialize() is parsed
+
+    test_event["data"]["order"]["product_type"] = 1
+    parsed = type_validate_python(OrderNotifyEvent, test_event).specialize()
+    assert type(parsed) is ProductOrderEvent
+
+    test_event["data"]["order"]["redeem_id"] = "redeem"
+    test_event["data"]["order"]["plan_id"] = ""
+    parsed = type_validate_python(OrderNotifyEvent, test_event).specialize()
+    assert type(parsed) is RedeemOrderEvent
+    assert parsed.plan_id is None
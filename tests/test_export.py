@@ -0,0 +1,35 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from nonebot.adapters.afdian.event import OrderNotifyEvent  # type: ignore
+from nonebot.adapters.afdian.export import ExportPipeline, JSONLSink  # type: ignore
+from nonebot.compat import type_validate_python
+
+
+def read_records(directory: Path) -> list[list[dict]]:
+    return [
+        [json.loads(line) for line in file.read_text().splitlines()]
+        for file in sorted(directory.iterdir())
+    ]
+
+
+@pytest.mark.asyncio
+async def test_export_jsonl(tmp_path: Path):
+    with (Path(__file__).parent / "events.json").open("r") as f:
+        order = type_validate_python(OrderNotifyEvent, json.load(f)).data.order
+
+    path = tmp_path / "orders.jsonl"
+    pipeline = ExportPipeline(JSONLSink(path, max_bytes=1), batch_size=2)
+    await pipeline.put_orders("fake", [order, order, order], "webhook")
+    await pipeline.close()
+
+    assert pipeline.exported == 3
+    # 每批写入后超过 max_bytes，下一批写入前轮转
+    files = read_records(tmp_path)
+    assert [len(records) for records in files] == [1, 2]
+    lines = files[0]
+    assert lines[0]["bot_id"] == "fake"
+    assert lines[0]["source"] == "webhook"
+    assert lines[0]["out_trade_no"] == order.out_trade_no
@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from nonebot.adapters.afdian.config import BotInfo  # type: ignore
+from nonebot.adapters.afdian.exception import NetworkError  # type: ignore
+from nonebot.adapters.afdian.health import HealthMonitor  # type: ignore
+
+
+class FakeAdapter:
+    def __init__(self):
+        self.bot_infos = {"fake": BotInfo(user_id="fake", token="token")}
+        self.bots: dict[str, Any] = {}
+        self.recovered: list[str] = []
+
+    async def _connect_bot(self, bot_info: BotInfo):
+        self.bots[bot_info.user_id] = SimpleNamespace(send_ping=self.send_ping)
+        return self.bots[bot_info.user_id]
+
+    async def send_ping(self):
+        raise NetworkError("ping failed")
+
+    def bot_disconnect(self, bot):
+        self.bots.pop("fake")
+
+    def _on_bot_recovered(self, user_id: str):
+        self.recovered.append(user_id)
+
+
+@pytest.mark.asyncio
+async def test_health_monitor():
+    adapter = FakeAdapter()
+    monitor = HealthMonitor(
+        adapter,  # type: ignore
+        interval=100,
+        retry_interval=10,
+        disconnect_after=2,
+        jitter=0,
+    )
+    await adapter._connect_bot(adapter.bot_infos["fake"])
+    assert monitor.next_interval("fake") == 100
+
+    # 单次失败仅缩短检查间隔，不视为不可用
+    assert await monitor.check("fake") is False
+    assert not monitor.is_degraded("fake")
+    assert monitor.next_interval("fake") == 10
+    assert "fake" in adapter.bots
+
+    assert await monitor.check("fake") is False
+    assert monitor.is_degraded("fake")
+    assert monitor.next_interval("fake") == 20
+    assert "fake" not in adapter.bots
+
+    # 断开后重新连接成功即恢复
+    assert await monitor.check("fake") is True
+    assert not monitor.is_degraded("fake")
+    assert adapter.recovered == ["fake"]
+    assert monitor.next_interval("fake") == 100
+
+
+@pytest.mark.asyncio
+async def test_health_monitor_unconnected():
+    adapter = FakeAdapter()
+    monitor = HealthMonitor(
+        adapter,  # type: ignore
+        interval=100,
+        retry_interval=10,
+        jitter=0,
+    )
+
+    # 首次连接失败的 Bot 以 retry_interval 重连，而不是等待完整的间隔
+    assert "fake" not in adapter.bots
+    assert monitor.next_interval("fake") == 10
@@ -0,0 +1,40 @@
+from pathlib import Path
+import subprocess
+import sys
+
+IMPORT_CODE = f"""
+import nonebot
+
+nonebot.adapters.__path__.append({str(Path(__file__).parent.parent / "nonebot" / "adapters")!r})
+import nonebot.adapters.afdian
+"""
+
+LAZY_MODULES = (
+    "nonebot.adapters.afdian.sponsor",
+    "nonebot.adapters.afdian.export",
+    "nonebot.adapters.afdian.ipc",
+    "nonebot.adapters.afdian.reconcile",
+    "nonebot.adapters.afdian.analytics",
+    "nonebot.adapters.afdian.record",
+    "nonebot.adapters.afdian.cache",
+)
+
+
+def test_lazy_import():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_CODE],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imported = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines()}
+    assert "nonebot.adapters.afdian.adapter" in imported
+    for module in LAZY_MODULES:
+        assert module not in imported
+
+
+def test_lazy_payload_models():
+    from nonebot.adapters.afdian import payload  # type: ignore
+    from nonebot.adapters.afdian.sponsor import SponsorResponse  # type: ignore
+
+    assert payload.SponsorResponse is SponsorResponse
@@ -0,0 +1,102 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+
+from nonebug import App
+import pytest
+
+from nonebot import get_adapter
+from nonebot.adapters.afdian import Adapter  # type: ignore
+from nonebot.adapters.afdian.config import BotInfo  # type: ignore
+from nonebot.adapters.afdian.event import OrderNotifyEvent  # type: ignore
+from nonebot.adapters.afdian.exception import NetworkError  # type: ignore
+from nonebot.adapters.afdian.ipc import IngestClient, IngestServer  # type: ignore
+from nonebot.compat import type_validate_python
+from nonebot.drivers import URL, Request
+
+
+@pytest.mark.asyncio
+async def test_ingest_roundtrip(tmp_path: Path):
+    with (Path(__file__).parent / "events.json").open("r") as f:
+        event = type_validate_python(OrderNotifyEvent, json.load(f))
+    received: list[tuple[str, dict[str, Any], bool]] = []
+
+    async def handler(user_id: str, data: dict[str, Any], verified: bool) -> None:
+        received.append((user_id, data, verified))
+
+    path = str(tmp_path / "ingest.sock")
+    server = IngestServer(path, handler)
+    client = IngestClient(path)
+    await server.start()
+    try:
+        await client.send("fake", event)
+        event._verified = True
+        await client.send("fake", event)
+    finally:
+        await client.close()
+        await server.close()
+
+    assert len(received) == 2
+    user_id, data, verified = received[0]
+    assert user_id == "fake"
+    assert verified is False
+    assert received[1][2] is True
+    assert type_validate_python(OrderNotifyEvent, data).data == event.data
+
+    with pytest.raises(NetworkError):
+        await IngestClient(str(tmp_path / "missing.sock")).send("fake", event)
+
+
+@pytest.mark.asyncio
+async def test_ingest_server_close_with_client(tmp_path: Path):
+    with (Path(__file__).parent / "events.json").open("r") as f:
+        event = type_validate_python(OrderNotifyEvent, json.load(f))
+
+    async def handler(user_id: str, data: dict[str, Any], verified: bool) -> None: ...
+
+    path = str(tmp_path / "ingest.sock")
+    server = IngestServer(path, handler)
+    client = IngestClient(path)
+    await server.start()
+    try:
+        await client.send("fake", event)
+        # ingest 进程仍保持连接时，主进程也能立即关闭
+        await asyncio.wait_for(server.close(), 2)
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_ingest_rejects_unconnected_bot(app: App, tmp_path: Path):
+    adapter = get_adapter(Adapter)
+    with (Path(__file__).parent / "events.json").open("r") as f:
+        test_data = json.load(f)
+
+    # 主进程中已连接的 Bot 正常接收
+    await adapter._handle_ingest("fake", test_data, False)
+    with pytest.raises(NetworkError):
+        await adapter._handle_ingest("unknown", test_data, False)
+
+    path = str(tmp_path / "ingest.sock")
+    server = IngestServer(path, adapter._handle_ingest)
+    client = IngestClient(path)
+    await server.start()
+    adapter.bot_infos["ingest"] = BotInfo(user_id="ingest")
+    adapter._ingest_client = client
+    try:
+        # 主进程没有该 Bot 时拒绝确认，ingest 进程返回 503 由爱发电重试
+        response = await adapter._handle_webhook(
+            Request(
+                "POST",
+                URL("/afdian/webhooks/ingest"),
+                content=json.dumps(test_data).encode(),
+            ),
+            "ingest",
+        )
+        assert response.status_code == 503
+    finally:
+        adapter._ingest_client = None
+        adapter.bot_infos.pop("ingest", None)
+        await client.close()
+        await server.close()
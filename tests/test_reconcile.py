@@ -0,0 +1,139 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from nonebug import App
+import pytest
+
+from nonebot import get_adapter
+from nonebot.adapters.afdian import Adapter, TokenBot  # type: ignore
+from nonebot.adapters.afdian.config import BotInfo  # type: ignore
+from nonebot.adapters.afdian.event import OrderNotifyEvent  # type: ignore
+from nonebot.adapters.afdian.payload import OrderResponse  # type: ignore
+from nonebot.adapters.afdian.reconcile import Reconciler  # type: ignore
+from nonebot.compat import model_dump, type_validate_python
+from nonebot.drivers import Request, Response
+
+
+def make_page(out_trade_nos: list[str], create_time: int = 0) -> OrderResponse:
+    return type_validate_python(
+        OrderResponse,
+        {
+            "ec": 200,
+            "em": "ok",
+            "data": {
+                "total_count": len(out_trade_nos),
+                "total_page": 1,
+                "request": {"user_id": "fake", "params": "", "ts": 0, "sign": ""},
+                "list": [
+                    {
+                        "out_trade_no": out_trade_no,
+                        "create_time": create_time + int(out_trade_no),
+                        "user_id": "user",
+                        "plan_id": "plan",
+                        "month": 1,
+                        "total_amount": "5.00",
+                        "show_amount": "5.00",
+                        "status": 2,
+                        "product_type": 0,
+                    }
+                    for out_trade_no in out_trade_nos
+                ],
+            },
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_reconcile_missed_orders():
+    pages = [
+        make_page(["2", "1"]),
+        make_page(["2", "1"]),
+        make_page(["4", "3", "2", "1"]),
+    ]
+
+    async def query_order_by_page(page: int, export: bool = True) -> OrderResponse:
+        return pages.pop(0)
+
+    async def dispatch(user_id: str, event: OrderNotifyEvent) -> None: ...
+
+    bot = SimpleNamespace(self_id="fake", query_order_by_page=query_order_by_page)
+    reconciler = Reconciler(bot, dispatch, min_interval=1, max_interval=4)  # type: ignore
+
+    # 首次对账只建立基线
+    assert await reconciler.reconcile() == []
+    assert not reconciler.found_new
+    reconciler._update_interval(reconciler.found_new)
+    assert reconciler.interval == 2
+
+    # 没有新订单时继续退避
+    assert await reconciler.reconcile() == []
+    reconciler._update_interval(reconciler.found_new)
+    assert reconciler.interval == 4
+
+    # 订单 4 已通过 Webhook 送达，订单 3 漏推；有新订单即恢复最小间隔
+    reconciler.mark_delivered("4")
+    missed = await reconciler.reconcile()
+    assert [order.out_trade_no for order in missed] == ["3"]
+    assert reconciler.found_new
+    reconciler._update_interval(reconciler.found_new)
+    assert reconciler.interval == 1
+
+
+@pytest.mark.asyncio
+async def test_reconcile_interval_follows_activity():
+    pages = [make_page(["1"]), make_page(["2", "1"])]
+
+    async def query_order_by_page(page: int, export: bool = True) -> OrderResponse:
+        return pages.pop(0)
+
+    async def dispatch(user_id: str, event: OrderNotifyEvent) -> None: ...
+
+    bot = SimpleNamespace(self_id="fake", query_order_by_page=query_order_by_page)
+    reconciler = Reconciler(bot, dispatch, min_interval=1, max_interval=4)  # type: ignore
+    reconciler.interval = 4
+
+    await reconciler.reconcile()
+    # 繁忙时订单都通过 Webhook 送达，没有漏推也应以最小间隔轮询
+    reconciler.mark_delivered("2")
+    assert await reconciler.reconcile() == []
+    assert reconciler.found_new
+    reconciler._update_interval(reconciler.found_new)
+    assert reconciler.interval == 1
+
+
+@pytest.mark.asyncio
+async def test_reconciler_kept_across_reconnect(app: App):
+    adapter = get_adapter(Adapter)
+    page = make_page([])
+
+    async def request(request: Request) -> Response:
+        return Response(200, content=json.dumps(model_dump(page)).encode())
+
+    adapter.request = request  # type: ignore
+    adapter.afdian_config.afdian_reconcile = True
+    adapter.bot_infos["reconcile"] = BotInfo(user_id="reconcile", token="token")
+    try:
+        adapter.bot_connect(TokenBot(adapter, "reconcile", "token"))
+        reconciler = adapter.reconcilers["reconcile"]
+        reconciler.mark_delivered("1")
+        task = adapter._reconcile_tasks["reconcile"]
+
+        # 断开后保留对账器，重连时沿用已送达记录与基线
+        adapter.bot_disconnect(adapter.bots["reconcile"])
+        await asyncio.sleep(0)
+        assert task.cancelled()
+        assert adapter.reconcilers["reconcile"] is reconciler
+        bot = TokenBot(adapter, "reconcile", "token")
+        adapter.bot_connect(bot)
+        assert adapter.reconcilers["reconcile"] is reconciler
+        assert reconciler.bot is bot
+        assert "1" in reconciler.seen
+
+        adapter.remove_bot("reconcile")
+        assert "reconcile" not in adapter.reconcilers
+        assert "reconcile" not in adapter._reconcile_tasks
+    finally:
+        adapter.afdian_config.afdian_reconcile = False
+        adapter.remove_bot("reconcile")
+        del adapter.request
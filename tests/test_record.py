@@ -0,0 +1,36 @@
+import json
+from pathlib import Path
+
+from nonebug import App
+import pytest
+
+from nonebot import get_adapter
+from nonebot.adapters.afdian import Adapter  # type: ignore
+from nonebot.adapters.afdian.record import (  # type: ignore
+    WebhookRecorder,
+    load_records,
+    replay,
+)
+
+
+@pytest.mark.asyncio
+async def test_record_and_replay(app: App, tmp_path: Path):
+    adapter = get_adapter(Adapter)
+    body = (Path(__file__).parent / "events.json").read_bytes()
+
+    path = tmp_path / "webhooks.jsonl"
+    recorder = WebhookRecorder(path)
+    recorder.record("fake", body)
+    recorder.record("fake", b"not json")
+    recorder.record("unfake", body)
+    await recorder.flush()
+
+    records = load_records(path)
+    assert len(records) == 3
+    assert json.loads(records[0].body) == json.loads(body)
+
+    report = await replay(adapter, records, speed=None)
+    assert report.count == 3
+    assert report.statuses == {200: 1, 400: 1, 404: 1}
+    assert report.throughput > 0
+    assert "requests=3" in str(report)
@@ -0,0 +1,176 @@
+import asyncio
+import json
+import os
+from pathlib import Path
+
+from nonebug import App
+import pytest
+
+from nonebot import get_adapter, get_bots
+from nonebot.adapters.afdian import Adapter, TokenBot  # type: ignore
+from nonebot.adapters.afdian.config import BotInfo  # type: ignore
+from nonebot.compat import model_dump
+from nonebot.drivers import Request, Response
+
+PING = {
+    "ec": 200,
+    "em": "ok",
+    "data": {
+        "uid": "added",
+        "request": {"user_id": "added", "params": "", "ts": 0, "sign": ""},
+    },
+}
+
+
+@pytest.mark.asyncio
+async def test_reload_bots(app: App):
+    adapter = get_adapter(Adapter)
+    original = list(adapter.bot_infos.values())
+    file_path = Path(__file__).parent / "events.json"
+    with open(file_path, encoding="utf-8") as f:  # noqa: ASYNC230
+        test_data = json.load(f)
+
+    async with app.test_server() as ctx:
+        client = ctx.get_client()
+
+        adapter.reload_bots([*original, BotInfo(user_id="hot")])
+        assert "hot" in get_bots()
+        assert "fake" in get_bots()
+        response = await client.post("/afdian/webhooks/hot", json=test_data)
+        assert response.status_code == 200
+
+        adapter.reload_bots(original)
+        assert "hot" not in get_bots()
+        assert "fake" in get_bots()
+        response = await client.post("/afdian/webhooks/hot", json=test_data)
+        assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_add_bot_watched_and_tasks_cancelled(app: App):
+    adapter = get_adapter(Adapter)
+    assert adapter.health is not None
+
+    async def request(request: Request) -> Response:
+        return Response(200, content=json.dumps(PING).encode())
+
+    async def source() -> None:
+        return None
+
+    adapter.request = request  # type: ignore
+    try:
+        assert await adapter.add_bot(BotInfo(user_id="added", token="token"))
+        health_task = adapter.health._tasks["added"]
+        watch_task = adapter.watch_bots(source, interval=3600)
+
+        # 关闭驱动器时取消所有后台循环
+        await adapter._cancel_tasks()
+        assert health_task.cancelled()
+        assert watch_task.cancelled()
+        assert not adapter.health._tasks
+        assert not adapter.tasks
+    finally:
+        adapter.remove_bot("added")
+        del adapter.request
+
+
+@pytest.mark.asyncio
+async def test_reload_token_in_place(app: App):
+    adapter = get_adapter(Adapter)
+
+    async def request(request: Request) -> Response:
+        return Response(200, content=json.dumps(PING).encode())
+
+    adapter.request = request  # type: ignore
+    try:
+        bot = await adapter.add_bot(BotInfo(user_id="added", token="old"))
+        assert isinstance(bot, TokenBot)
+        adapter.reload_bots(
+            [*adapter.bot_infos.values(), BotInfo(user_id="added", token="new")]
+        )
+        # 只替换 Token，不重新连接
+        assert adapter.bots["added"] is bot
+        assert bot.token == "new"
+    finally:
+        adapter.remove_bot("added")
+        del adapter.request
+
+
+@pytest.mark.asyncio
+async def test_connect_discarded_after_reload(app: App):
+    adapter = get_adapter(Adapter)
+    release = asyncio.Event()
+
+    async def request(request: Request) -> Response:
+        await release.wait()
+        return Response(200, content=json.dumps(PING).encode())
+
+    adapter.request = request  # type: ignore
+    original = list(adapter.bot_infos.values())
+    try:
+        # 连接期间被移除的 Bot 不会在连接完成后出现
+        adapter.bot_infos["added"] = old = BotInfo(user_id="added", token="old")
+        connecting = asyncio.create_task(adapter._connect_bot(old))
+        await asyncio.sleep(0)
+        adapter.remove_bot("added")
+        release.set()
+        assert await connecting is None
+        assert "added" not in adapter.bots
+
+        # 连接期间替换了 Token，旧 Token 的连接结果被丢弃
+        release.clear()
+        adapter.bot_infos["added"] = old
+        connecting = asyncio.create_task(adapter._connect_bot(old))
+        await asyncio.sleep(0)
+        adapter.reload_bots([*original, BotInfo(user_id="added", token="new")])
+        release.set()
+        assert await connecting is None
+        for _ in range(100):
+            if "added" in adapter.bots:
+                break
+            await asyncio.sleep(0.01)
+        assert adapter.bots["added"].token == "new"  # type: ignore
+    finally:
+        adapter.remove_bot("added")
+        del adapter.request
+
+
+@pytest.mark.asyncio
+async def test_bots_file_source(tmp_path: Path):
+    path = tmp_path / "bots.json"
+    path.write_text(json.dumps([{"user_id": "file"}]), encoding="utf-8")
+    source = Adapter._bots_file_source(path)
+
+    assert await source() == [BotInfo(user_id="file")]
+    # 修改时间未变化时不重新读取
+    assert await source() is None
+
+    path.write_text(
+        json.dumps([{"user_id": "file", "token": "token"}]), encoding="utf-8"
+    )
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 1))
+    assert await source() == [BotInfo(user_id="file", token="token")]
+
+
+@pytest.mark.asyncio
+async def test_watch_bots_file(app: App, tmp_path: Path):
+    adapter = get_adapter(Adapter)
+    original = list(adapter.bot_infos.values())
+    path = tmp_path / "bots.json"
+    path.write_text(
+        json.dumps([*(model_dump(info) for info in original), {"user_id": "file"}]),
+        encoding="utf-8",
+    )
+
+    task = adapter.watch_bots(Adapter._bots_file_source(path), interval=0.01)
+    try:
+        for _ in range(100):
+            if "file" in adapter.bots:
+                break
+            await asyncio.sleep(0.01)
+        assert "file" in get_bots()
+    finally:
+        task.cancel()
+        adapter.reload_bots(original)
+    assert "file" not in get_bots()
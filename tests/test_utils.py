@@ -0,0 +1,33 @@
+import hashlib
+import json
+
+import pytest
+
+from nonebot.adapters.afdian.utils import Signer, dumps_params  # type: ignore
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"a": 333},
+        {"out_trade_no": "202106232138371083454010626"},
+        {"out_trade_no": "2021,2022"},
+        {"page": 1, "per_page": 20},
+        {"out_trade_no": 'quote"back\\slash'},
+        {"out_trade_no": "中文"},
+        {"flag": True, "none": None, "float": 1.5},
+    ],
+)
+def test_signer_matches_reference(params: dict):
+    user_id, token, ts = "user", "token", 1700000000
+    param_json_data = dumps_params(params)
+    assert param_json_data == json.dumps(params)
+
+    expected = hashlib.md5(
+        f"{token}params{json.dumps(params)}ts{ts}user_id{user_id}".encode()
+    ).hexdigest()
+    signer = Signer(user_id, token)
+    assert signer.sign(param_json_data, ts) == expected
+    # 签名上下文可重复使用
+    assert signer.sign(param_json_data, ts) == expected
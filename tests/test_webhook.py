@@ -1,10 +1,19 @@
+import asyncio
 import json
 from pathlib import Path
+from typing import Any
 
+import httpx
 from nonebug import App
 import pytest
 
-from nonebot import get_bots
+from nonebot import get_adapter, get_bots
+from nonebot.adapters.afdian import Adapter  # type: ignore
+from nonebot.adapters.afdian.event import (  # type: ignore
+    OrderNotifyEvent,
+    ProductOrderEvent,
+)
+from nonebot.compat import type_validate_python
 
 
 @pytest.mark.asyncio
@@ -21,3 +30,89 @@ async def test_webhook_test_order(app: App):
         response = await client.post("/afdian/webhooks/fake", json=test_data)
         assert response.status_code == 200
         assert "fake" in get_bots()
+
+
+@pytest.mark.asyncio
+async def test_asgi_webhook_app(app: App):
+    adapter = get_adapter(Adapter)
+    file_path = Path(__file__).parent / "events.json"
+
+    with open(file_path, encoding="utf-8") as f:  # noqa: ASYNC230
+        test_data = json.load(f)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=adapter.asgi_webhook_app()),
+        base_url="http://test",
+    ) as client:
+        response = await client.post("/afdian/webhooks/unfake", json=test_data)
+        assert response.status_code == 404
+        response = await client.get("/afdian/webhooks/fake")
+        assert response.status_code == 405
+        response = await client.post("/afdian/webhooks/fake", json=test_data)
+        assert response.status_code == 200
+        assert response.json() == {"ec": 200, "em": "success"}
+
+
+@pytest.mark.asyncio
+async def test_event_filter(app: App):
+    adapter = get_adapter(Adapter)
+    file_path = Path(__file__).parent / "events.json"
+
+    with open(file_path, encoding="utf-8") as f:  # noqa: ASYNC230
+        test_data = json.load(f)
+    async with app.test_server() as ctx:
+        client = ctx.get_client()
+        response = await client.post("/afdian/webhooks/fake", json=test_data)
+        assert response.status_code == 200
+
+    handled: list[OrderNotifyEvent] = []
+
+    async def handle_event(event: OrderNotifyEvent) -> None:
+        handled.append(event)
+
+    bot = get_bots()["fake"]
+    bot.handle_event = handle_event  # type: ignore
+    event = type_validate_python(OrderNotifyEvent, test_data)
+
+    @adapter.add_event_filter
+    def only_products(event: OrderNotifyEvent) -> bool:
+        return isinstance(event, ProductOrderEvent)
+
+    try:
+        await adapter._dispatch("fake", event)
+        await asyncio.sleep(0)
+        assert handled == []
+
+        test_data["data"]["order"]["product_type"] = 1
+        await adapter._dispatch(
+            "fake", type_validate_python(OrderNotifyEvent, test_data)
+        )
+        await asyncio.sleep(0)
+        assert len(handled) == 1
+        assert isinstance(handled[0], ProductOrderEvent)
+    finally:
+        adapter.remove_event_filter(only_products)
+
+
+@pytest.mark.asyncio
+async def test_asgi_webhook_app_lifespan_already_started(app: App):
+    adapter = get_adapter(Adapter)
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        return messages.pop(0)
+
+    async def send(message: dict[str, Any]) -> None:
+        sent.append(message)
+
+    # 测试中驱动器的生命周期已经启动，重复启动时报告失败而不是抛出异常
+    await adapter.asgi_webhook_app(lifespan=True)({"type": "lifespan"}, receive, send)
+    assert [message["type"] for message in sent] == ["lifespan.startup.failed"]
+
+    sent.clear()
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    await adapter.asgi_webhook_app()({"type": "lifespan"}, receive, send)
+    assert [message["type"] for message in sent] == [
+        "lifespan.startup.complete",
+        "lifespan.shutdown.complete",
+    ]